@@ -0,0 +1,125 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from job_postings import load_job_descriptions
+from job_vectorizer import get_job_vectorizer, use_job_vectorizer
+from model import (DIRECT_MATCH_BOOST, ScoringEngine, assemble_results, extend_skill, extract_keywords,
+                   get_item_text, load_resumes, merge_results, resume_sections,
+                   results_to_dict)
+
+# Batch mode: one set of resumes scored against many job descriptions.
+#
+# The resume side (item texts, skill synonyms and related terms) doesn't
+# depend on the job, so it is built and vectorized once. Items and job
+# keywords live in the shared job vectorizer's term space with unit-length
+# rows, so every item is scored against every job with one sparse matrix
+# product, score = items @ keywords.T, and the scores are the ones
+# ScoringEngine.score() gives for each job on its own. Each job's scores
+# don't depend on the other jobs in the batch, so large job sets are split
+# into chunks scored in worker processes.
+
+BATCH_WORKERS = int(os.getenv('BATCH_SCORING_WORKERS', str(os.cpu_count() or 1)))
+BATCH_CHUNK_SIZE = int(os.getenv('BATCH_SCORING_CHUNK_SIZE', '64'))
+
+
+class ResumeBatch:
+    # The job-independent part of scoring resumes: every item and extended
+    # skill text, in resume_sections() order, and each skill's match words
+    def __init__(self, resumes):
+        self.layout = []
+        self.texts = []
+        self.skill_words = []
+        for name, resume in resumes:
+            item_sections, skill_sections = resume_sections(resume)
+            start, skill_start = len(self.texts), len(self.skill_words)
+            self.texts.extend(get_item_text(item) for _, items, _ in item_sections for item in items)
+            for _, skills in skill_sections:
+                for skill in skills:
+                    extended_skill, match_words = extend_skill(skill)
+                    self.texts.append(get_item_text(extended_skill))
+                    self.skill_words.append(match_words)
+            self.layout.append((name, item_sections, skill_sections, start, len(self.texts), skill_start))
+
+    def results_for(self, scores, boosts):
+        # process_resume() output per resume for one job's score column
+        all_results = []
+        for name, item_sections, skill_sections, start, end, skill_start in self.layout:
+            skill_count = end - start - sum(len(items) for _, items, _ in item_sections)
+            resume_boosts = iter(boosts[skill_start:skill_start + skill_count])
+            all_results.append((name, assemble_results(item_sections, skill_sections,
+                                                       iter(scores[start:end]), resume_boosts)))
+        return all_results
+
+
+def score_matrix(items, job_descriptions):
+    # Cosine scores of every vectorized item against every job, shape (items, jobs)
+    keyword_texts = [' '.join(extract_keywords(job_description)) for job_description in job_descriptions]
+    keywords = get_job_vectorizer().transform(keyword_texts)
+    return (items @ keywords.T).toarray()
+
+def boost_matrix(skill_words, job_descriptions):
+    # DIRECT_MATCH_BOOST where any of a skill's words occurs in the job text, shape (skills, jobs)
+    jobs = [job_description.lower() for job_description in job_descriptions]
+    words = {word for match_words in skill_words for word in match_words}
+    present = {word: [word in job for job in jobs] for word in words}
+    boosts = np.zeros((len(skill_words), len(jobs)))
+    for i, match_words in enumerate(skill_words):
+        if match_words:
+            boosts[i] = np.any([present[word] for word in match_words], axis=0) * DIRECT_MATCH_BOOST
+    return boosts
+
+def score_chunk(items, skill_words, job_descriptions):
+    return score_matrix(items, job_descriptions), boost_matrix(skill_words, job_descriptions)
+
+def score_jobs(resumes, job_descriptions, workers=None, chunk_size=None):
+    # resumes is a list of (name, parsed resume dict) pairs. Returns one
+    # ScoringEngine.score()-shaped result per job description, in order.
+    workers = BATCH_WORKERS if workers is None else workers
+    chunk_size = chunk_size or BATCH_CHUNK_SIZE
+    batch = ResumeBatch(resumes)
+    if not job_descriptions:
+        return []
+    vectorizer = get_job_vectorizer()
+    items = vectorizer.transform(batch.texts)
+
+    chunks = [job_descriptions[i:i + chunk_size] for i in range(0, len(job_descriptions), chunk_size)]
+    if workers > 1 and len(chunks) > 1:
+        # Workers get this process's vectorizer once, when they start
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=use_job_vectorizer,
+                                 initargs=(vectorizer,)) as executor:
+            parts = list(executor.map(score_chunk, [items] * len(chunks), [batch.skill_words] * len(chunks), chunks))
+    else:
+        parts = [score_chunk(items, batch.skill_words, chunk) for chunk in chunks]
+    scores = np.hstack([part[0] for part in parts])
+    boosts = np.hstack([part[1] for part in parts])
+
+    return [merge_results(batch.results_for(scores[:, j], boosts[:, j])) for j in range(len(job_descriptions))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score parsed resumes against every job posting in a directory.')
+    parser.add_argument('--parsed-dir', required=True, help='Directory of parsed resume YAML files')
+    parser.add_argument('--jobs-dir', required=True, help='Directory of job postings (.txt or .json)')
+    parser.add_argument('--output', help='Write the top items per job to this JSON file')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for large job sets')
+    args = parser.parse_args(argv)
+
+    ScoringEngine()  # NLTK data
+    postings = load_job_descriptions(args.jobs_dir)
+    results = score_jobs(load_resumes(args.parsed_dir), [text for _, text in postings], workers=args.workers)
+    summary = {name: results_to_dict(job_results) for (name, _), job_results in zip(postings, results)}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Scored {len(postings)} job postings. Results written to {args.output}")
+    else:
+        for name, job_results in summary.items():
+            top = ', '.join(f"{entry['item']['company']} ({entry['score']:.2f})" for entry in job_results['experiences'])
+            print(f"{name}: {top}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# One resume set against many job descriptions: ScoringEngine.score() once
+# per job versus batch_scoring.score_jobs() (resume side vectorized once, one
+# sparse product per chunk of jobs), in one process and across worker
+# processes. The jobs are synthetic: random mixes of the sentences of the
+# postings in job_postings/. Also checks that batch scores match the per-job
+# scores; that the model.py reports survived the refactor behind the batch
+# path is checked with benchmarks/compare_reports.py.
+# Run from the backend directory: python benchmarks/bench_batch_scoring.py [jobs ...]
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import model
+from batch_scoring import score_jobs
+
+PARSED_DIR = os.path.join('parsed_resumes', '20240705_070212')
+SENTENCES_PER_JOB = 40
+LOOPED_JOBS = 20  # the per-job loop is timed on this many and scaled
+
+def synthetic_jobs(count, seed=0):
+    sentences = []
+    for path in sorted(glob.glob(os.path.join('job_postings', '*', '*.txt'))):
+        sentences.extend(s.strip() for s in re.split(r'(?<=[.!?])\s+|\n+', model.load_job_description(path)) if s.strip())
+    generator = random.Random(seed)
+    return [' '.join(generator.sample(sentences, min(SENTENCES_PER_JOB, len(sentences)))) for _ in range(count)]
+
+def flatten(results):
+    return [(section, str(entry['item']), round(entry['score'], 9))
+            for section, entries in model.results_to_dict(results).items() for entry in entries]
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:]] or [50, 200, 500]
+    engine = model.ScoringEngine()
+    resumes = model.load_resumes(PARSED_DIR)
+    workers = os.cpu_count() or 1
+
+    for count in counts:
+        jobs = synthetic_jobs(count)
+
+        start = time.perf_counter()
+        looped = [engine.score(resumes, job) for job in jobs[:LOOPED_JOBS]]
+        loop_time = (time.perf_counter() - start) / min(LOOPED_JOBS, count) * count
+
+        start = time.perf_counter()
+        batched = score_jobs(resumes, jobs, workers=1)
+        batch_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        score_jobs(resumes, jobs, workers=workers)
+        parallel_time = time.perf_counter() - start
+
+        matches = all(flatten(a) == flatten(b) for a, b in zip(looped, batched))
+        print(f"{count:4d} jobs: score() per job ~{loop_time:7.2f} s   score_jobs {batch_time:6.2f} s"
+              f"   {workers} workers {parallel_time:6.2f} s   same scores: {matches}")
+        if not matches:
+            sys.exit(1)
@@ -0,0 +1,81 @@
+# Candidate ranking over many parsed resumes: re-reading and re-scoring every
+# YAML per job (what model.main does for its directory) versus the
+# CandidateIndex, which vectorizes each file once. Times the first index
+# build, an incremental sync after one new file, and a ranking query. The
+# resumes are synthetic: the sample resumes with their bullets reshuffled.
+# Run from the backend directory: python benchmarks/bench_candidate_index.py [resumes]
+import copy
+import glob
+import os
+import random
+import sys
+import tempfile
+import time
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import model
+from candidate_index import CandidateIndex
+
+PARSED_DIR = os.path.join('parsed_resumes', '20240705_070212')
+
+def synthetic_resumes(count, seed=0):
+    samples = [resume for _, resume in model.load_resumes(PARSED_DIR)]
+    bullets = [line for resume in samples for section in ('experience', 'projects')
+               for entry in resume.get(section) or [] for line in entry.get('description') or []]
+    generator = random.Random(seed)
+    for i in range(count):
+        resume = copy.deepcopy(samples[i % len(samples)])
+        for section in ('experience', 'projects'):
+            for entry in resume.get(section) or []:
+                entry['description'] = generator.sample(bullets, min(3, len(bullets)))
+        resume['information']['name'] = f'Candidate {i}'
+        yield resume
+
+def write_resumes(directory, resumes, start=0):
+    for i, resume in enumerate(resumes, start):
+        with open(os.path.join(directory, f'candidate_{i:05d}.yaml'), 'w') as file:
+            yaml.safe_dump(resume, file)
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    engine = model.ScoringEngine()
+    job_description = model.load_job_description(sorted(glob.glob(os.path.join('job_postings', '*', '*.txt')))[-1])
+
+    with tempfile.TemporaryDirectory() as directory:
+        parsed_dir = os.path.join(directory, 'parsed')
+        os.makedirs(parsed_dir)
+        write_resumes(parsed_dir, synthetic_resumes(count))
+
+        start = time.perf_counter()
+        engine.score(model.load_resumes(parsed_dir), job_description)
+        rescan = time.perf_counter() - start
+
+        index = CandidateIndex(os.path.join(directory, 'index.sqlite3'))
+        start = time.perf_counter()
+        index.sync(parsed_dir)
+        build = time.perf_counter() - start
+
+        write_resumes(parsed_dir, synthetic_resumes(1, seed=1), start=count)
+        start = time.perf_counter()
+        indexed = index.sync(parsed_dir)
+        incremental = time.perf_counter() - start
+
+        index.rank(job_description)  # stacks the item matrix once
+        start = time.perf_counter()
+        top = index.rank(job_description, top_n=10)
+        query = time.perf_counter() - start
+
+        reopened = CandidateIndex(index.db_path)
+        start = time.perf_counter()
+        reopened.rank(job_description)
+        cold_query = time.perf_counter() - start
+
+        print(f"{count} resumes: re-read and score every YAML {rescan:7.2f} s")
+        print(f"  index build {build:7.2f} s   sync after 1 new file {incremental * 1000:7.1f} ms ({indexed} indexed)")
+        print(f"  ranking query {query * 1000:7.1f} ms   from a freshly opened index {cold_query * 1000:7.1f} ms")
+        print(f"  best: {top[0]['path']} ({top[0]['score']:.3f})   {index.stats()}")
@@ -0,0 +1,53 @@
+# Compare the indexed get_unique_items with the previous pairwise scan as the
+# number of scored items grows. Run from the backend directory:
+# python benchmarks/bench_dedup.py
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import model
+from nltk.corpus import stopwords
+
+def legacy_unique_items(items):
+    # The previous get_unique_items: every item against every kept key
+    seen = set()
+    unique_items = []
+    stop_words = set(stopwords.words('english'))
+    for item, score in items:
+        item_key = model.get_item_key(item)
+        item_key_short = str(item_key[:8] if len(item_key) >= 8 else item_key)
+        non_stop_words = [word.lower() for word in item_key.split() if word.lower() not in stop_words]
+        is_duplicate = False
+        for seen_key in seen:
+            seen_non_stop_words = [word.lower() for word in seen_key.split() if word.lower() not in stop_words]
+            shared_words = set(non_stop_words) & set(seen_non_stop_words)
+            if item_key_short == seen_key[:8] or len(shared_words) >= 2:
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            seen.add(item_key)
+            unique_items.append((item, score))
+    return unique_items
+
+def make_items(count):
+    random.seed(count)
+    return [({'title': f'{i:06d} project {random.randint(0, 10 * count)} tool{random.randint(0, 10 * count)}'}, random.random())
+            for i in range(count)]
+
+if __name__ == '__main__':
+    model.ensure_nltk_data()
+    for count in (100, 1000, 4000):
+        items = make_items(count)
+        start = time.perf_counter()
+        expected = legacy_unique_items(items)
+        legacy = time.perf_counter() - start
+        start = time.perf_counter()
+        result = model.get_unique_items(items)
+        indexed = time.perf_counter() - start
+        assert result == expected
+        print(f"{count:>5} items  pairwise {legacy * 1000:9.1f} ms   indexed {indexed * 1000:7.1f} ms   ({legacy / indexed:.0f}x)")
@@ -0,0 +1,46 @@
+# Compare the old subprocess path for /api/run-model with the resident ScoringEngine.
+# Run from the backend directory: python benchmarks/bench_engine.py [runs]
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+def time_subprocess(runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'model.py'], check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def time_engine(runs):
+    start = time.perf_counter()
+    import model
+    engine = model.ScoringEngine()
+    startup = time.perf_counter() - start
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.main(engine)
+        timings.append(time.perf_counter() - start)
+    return startup, timings
+
+def report(label, timings):
+    print(f"{label:<28} mean {sum(timings) / len(timings) * 1000:8.1f} ms   min {min(timings) * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    subprocess_timings = time_subprocess(runs)
+    startup, engine_timings = time_engine(runs)
+
+    print(f"Runs: {runs}")
+    report("subprocess model.py", subprocess_timings)
+    print(f"{'engine startup (once)':<28} {startup * 1000:13.1f} ms")
+    report("warm engine", engine_timings)
+    print(f"Speedup per request: {min(subprocess_timings) / min(engine_timings):.1f}x")
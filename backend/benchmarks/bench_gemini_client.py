@@ -0,0 +1,106 @@
+# Per-resume Gemini overhead of the old call pattern (new GenerativeModel per
+# file, File API upload for every page) versus the shared GeminiClient (cached
+# model, inline page images), against the offline fake backend. Also checks
+# that the client keeps to its concurrency limit and recovers from transient
+# errors with backoff.
+# Run from the backend directory: python benchmarks/bench_gemini_client.py
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from google.api_core import exceptions as api_exceptions
+from fake_gemini import FakeGenerativeModel, fake_upload_file
+from gemini_client import GeminiClient
+from rate_limiter import TokenBucket
+
+# Simulated costs: building a model object, one upload round trip, one
+# generate_content call
+MODEL_SETUP = 0.02
+UPLOAD_LATENCY = 0.25
+API_LATENCY = 0.4
+PAGE = b'\x89PNG' + b'\x00' * 120000
+
+def slow_model(name):
+    time.sleep(MODEL_SETUP)
+    return FakeGenerativeModel(name, latency=API_LATENCY)
+
+def slow_upload(path, **kwargs):
+    time.sleep(UPLOAD_LATENCY)
+    return fake_upload_file(path, **kwargs)
+
+def unlimited():
+    return TokenBucket(60000)
+
+def legacy_parse(index):
+    model = slow_model('gemini-1.5-flash')
+    image = slow_upload(path=PAGE, mime_type='image/png')
+    return model.generate_content([image, 'prompt'])
+
+def timed(handle, files):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=files) as executor:
+        list(executor.map(handle, range(files)))
+    return time.perf_counter() - start
+
+def check_concurrency(limit, calls):
+    # Track how many fake requests are in flight at once
+    state = {'active': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    class TrackingModel(FakeGenerativeModel):
+        def generate_content(self, contents, **kwargs):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            try:
+                return super().generate_content(contents, **kwargs)
+            finally:
+                with lock:
+                    state['active'] -= 1
+
+    client = GeminiClient(model_factory=lambda name: TrackingModel(name, latency=0.05),
+                          upload=fake_upload_file, limiter=unlimited(), max_concurrency=limit)
+    with ThreadPoolExecutor(max_workers=calls) as executor:
+        list(executor.map(lambda i: client.generate_text(['prompt']), range(calls)))
+    return state['peak']
+
+def check_retries(failures):
+    # A model that is overloaded for the first `failures` calls
+    calls = {'count': 0}
+
+    class FlakyModel(FakeGenerativeModel):
+        def generate_content(self, contents, **kwargs):
+            calls['count'] += 1
+            if calls['count'] <= failures:
+                raise api_exceptions.ServiceUnavailable('overloaded')
+            return super().generate_content(contents, **kwargs)
+
+    delays = []
+    client = GeminiClient(model_factory=lambda name: FlakyModel(name, reply='ok'), upload=fake_upload_file,
+                          limiter=unlimited(), retries=3, backoff=0.5, sleep=delays.append)
+    return client.generate_text(['prompt']), delays
+
+if __name__ == '__main__':
+    files = 5
+    client = GeminiClient(model_factory=slow_model, upload=slow_upload, limiter=unlimited(), max_concurrency=files)
+    def client_parse(index):
+        return client.generate_text([client.image_part(PAGE), 'prompt'])
+
+    print(f"{files} one-page resumes in parallel, fake latencies: model {MODEL_SETUP * 1000:.0f} ms, "
+          f"upload {UPLOAD_LATENCY * 1000:.0f} ms, generate {API_LATENCY * 1000:.0f} ms")
+    print(f"  model per file + upload    {timed(legacy_parse, files):6.2f} s")
+    client_parse(0)
+    print(f"  shared client, inline page {timed(client_parse, files):6.2f} s")
+
+    peak = check_concurrency(limit=3, calls=12)
+    print(f"12 parallel calls with max_concurrency=3: peak in flight {peak}")
+    reply, delays = check_retries(failures=2)
+    print(f"2 transient failures: reply {reply!r}, backoff delays {', '.join(f'{d:.2f}s' for d in delays)}")
+    if peak > 3 or reply != 'ok' or len(delays) != 2:
+        sys.exit(1)
@@ -0,0 +1,122 @@
+# Prompt size and fetch latency for job postings: the old path (bare
+# requests.get, raw HTML pasted into the prompt) versus job_fetcher (pooled
+# session, timeouts, byte budget, HTML reduced to posting text). Fixtures are
+# saved pages in benchmarks/fixtures/job_postings, served from a local HTTP
+# server, plus a slow host and an oversized page.
+# Run from the backend directory: python benchmarks/bench_job_fetch.py
+import glob
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import requests
+import job_fetcher
+from job_fetcher import fetch_html, html_to_text
+
+FIXTURE_DIR = os.path.join('benchmarks', 'fixtures', 'job_postings')
+SLOW_HOST_DELAY = 3.0
+HUGE_PAGE_BYTES = 32 * 1024 * 1024
+ROUNDS = 20
+
+def load_fixtures():
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+        with open(path, 'rb') as file:
+            fixtures['/' + os.path.basename(path)] = file.read()
+    return fixtures
+
+def start_server(fixtures):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == '/slow':
+                time.sleep(SLOW_HOST_DELAY)
+                body = b'<html><body><p>late</p></body></html>'
+            elif self.path == '/huge':
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(HUGE_PAGE_BYTES))
+                self.end_headers()
+                chunk = b'<p>' + b'filler text ' * 5000 + b'</p>'
+                sent = 0
+                try:
+                    while sent < HUGE_PAGE_BYTES:
+                        piece = chunk[:HUGE_PAGE_BYTES - sent]
+                        self.wfile.write(piece)
+                        sent += len(piece)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                return
+            else:
+                body = fixtures.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def legacy_fetch(url):
+    return requests.get(url).text
+
+def pooled_fetch(url):
+    return html_to_text(fetch_html(url))
+
+def mean_time(func, url, rounds=ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = func(url)
+    return (time.perf_counter() - start) / rounds, result
+
+def timed_call(func, url):
+    start = time.perf_counter()
+    try:
+        result = func(url)
+    except requests.RequestException as e:
+        result = type(e).__name__
+    return time.perf_counter() - start, result
+
+if __name__ == '__main__':
+    fixtures = load_fixtures()
+    server = start_server(fixtures)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+
+    print(f"{'fixture':<22}{'raw prompt':>14}{'reduced':>12}{'~tokens':>16}{'old fetch':>12}{'new fetch+reduce':>19}")
+    for path in fixtures:
+        url = base + path
+        legacy_time, raw = mean_time(legacy_fetch, url)
+        pooled_time, text = mean_time(pooled_fetch, url)
+        tokens = f"{len(raw) // 4:,} -> {len(text) // 4:,}"
+        print(f"{path[1:]:<22}{len(raw):>14,}{len(text):>12,}{tokens:>16}"
+              f"{legacy_time * 1000:>10.1f}ms{pooled_time * 1000:>17.1f}ms")
+
+    job_fetcher.READ_TIMEOUT = 0.5
+    elapsed, result = timed_call(pooled_fetch, base + '/slow')
+    print(f"slow host ({SLOW_HOST_DELAY:.0f} s to respond), read timeout 0.5 s: gave up after {elapsed:.2f} s ({result})")
+    elapsed, result = timed_call(legacy_fetch, base + '/slow')
+    print(f"  bare requests.get waited {elapsed:.2f} s")
+
+    elapsed, html = timed_call(lambda url: fetch_html(url), base + '/huge')
+    print(f"{HUGE_PAGE_BYTES // (1024 * 1024)} MB page: read {len(html):,} bytes (budget {job_fetcher.MAX_FETCH_BYTES:,}) in {elapsed:.2f} s")
+    elapsed, html = timed_call(legacy_fetch, base + '/huge')
+    print(f"  bare requests.get read {len(html):,} bytes in {elapsed:.2f} s")
+    server.shutdown()
@@ -0,0 +1,55 @@
+# Time extract_keywords on a saved posting and on a long HTML-like posting,
+# against the previous per-token expansion.
+# Run from the backend directory: python benchmarks/bench_keywords.py
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import model
+
+def legacy_extract_keywords(text):
+    # The previous extract_keywords: expand every token, duplicates included
+    words = re.findall(r'\w+', text.lower())
+    keywords = [word for word in words if len(word) > 2]
+    extended_keywords = keywords.copy()
+    for word in keywords:
+        extended_keywords.extend(model.get_related_terms(word))
+    return list(set(extended_keywords))
+
+def long_posting(text, repeats=300):
+    # Approximate a scraped page: the posting repeated inside markup with noise tokens
+    random.seed(0)
+    words = re.findall(r'\w+', text)
+    chunks = []
+    for i in range(repeats):
+        noise = ' '.join(random.choice(words) + str(random.randint(0, 999)) for _ in range(20))
+        chunks.append(f'<div class="section-{i}"><p>{text}</p><span>{noise}</span></div>')
+    return '<html><body>' + '\n'.join(chunks) + '</body></html>'
+
+def time_call(func, text, rounds=3):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+if __name__ == '__main__':
+    postings = sorted(glob.glob(os.path.join('job_postings', '*', '*.txt')))
+    short = model.load_job_description(postings[-1])
+    postings = [('short', short), ('long', long_posting(short))]
+
+    for label, text in postings:
+        legacy, legacy_keywords = time_call(legacy_extract_keywords, text)
+        bounded, keywords = time_call(model.extract_keywords, text)
+        same = 'same set' if set(keywords) == set(legacy_keywords) else f'capped to {len(keywords)}'
+        print(f"{label:<6} {len(text):>9} chars  legacy {legacy * 1000:8.1f} ms ({len(legacy_keywords)} keywords)"
+              f"  bounded {bounded * 1000:8.1f} ms ({same})")
@@ -0,0 +1,69 @@
+# Repeat "generate resume" clicks on an unchanged resume: PdfService
+# compiling every time versus render_cached serving the content-addressed
+# PDF, plus a check that the eviction keeps the cache under its byte limit
+# and that editing the resume yields a new name. Needs pdflatex on PATH (or
+# LATEX=/path/to/pdflatex).
+# Run from the backend directory: python benchmarks/bench_pdf_cache.py
+import copy
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATOR_DIR = os.path.join(os.path.dirname(BACKEND_DIR), 'resume_generator')
+sys.path.insert(0, os.path.join(GENERATOR_DIR, 'scripts'))
+os.chdir(BACKEND_DIR)
+
+from pdf_cache import PdfCache
+from pdf_service import PdfService
+
+LATEX = os.getenv('LATEX', 'pdflatex')
+CLICKS = 10
+DISTINCT_RESUMES = 8
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(CLICKS):
+        result = func(*args)
+    return (time.perf_counter() - start) / CLICKS * 1000, result
+
+if __name__ == '__main__':
+    with open('new_resume.yaml', 'r') as file:
+        data = yaml.safe_load(file)
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = PdfService(latex=LATEX, format_dir=os.path.join(directory, 'formats'))
+        cache = PdfCache(os.path.join(directory, 'pdfs'))
+        service.render_pdf(data, os.path.join(directory, 'warmup.pdf'))  # builds the preamble format
+
+        compile_time, _ = timed(service.render_pdf, data, os.path.join(directory, 'out.pdf'))
+        service.render_cached(data, cache)
+        cached_time, path = timed(service.render_cached, data, cache)
+        print(f"compile on every click: {compile_time:8.2f} ms")
+        print(f"content-addressed cache: {cached_time:7.3f} ms   ({compile_time / cached_time:.0f}x)   {cache.stats()}")
+
+        # Same data with its keys in another order hashes to the same name;
+        # an edited resume gets a new one
+        reordered = dict(reversed(list(data.items())))
+        edited = copy.deepcopy(data)
+        edited['information']['name'] += ' Jr.'
+        same = service.render_cached(reordered, cache) == path
+        changed = service.render_cached(edited, cache) != path
+        print(f"key order ignored: {same}   edited resume gets a new name: {changed}")
+
+        # Bound the cache to a few PDFs and fill it with distinct resumes
+        size = os.path.getsize(path)
+        bounded = PdfCache(os.path.join(directory, 'bounded'), max_bytes=size * 3)
+        for index in range(DISTINCT_RESUMES):
+            variant = copy.deepcopy(data)
+            variant['information']['name'] = f'Candidate {index}'
+            service.render_cached(variant, bounded)
+        total = sum(os.path.getsize(os.path.join(bounded.directory, name)) for name in os.listdir(bounded.directory))
+        within = total <= bounded.max_bytes
+        print(f"{DISTINCT_RESUMES} resumes into a {bounded.max_bytes} byte cache: "
+              f"{len(os.listdir(bounded.directory))} kept, {total} bytes, within limit: {within}")
+        if not (same and changed and within):
+            sys.exit(1)
@@ -0,0 +1,77 @@
+# Resume PDF rendering: the old path (a python subprocess running
+# generate_resume.py, pdflatex on the full preamble in resume_generator/)
+# versus PdfService in-process with the precompiled preamble format, plus a
+# concurrency check that parallel renders for different resumes each end
+# up with their own PDF. Needs pdflatex on PATH (or LATEX=/path/to/pdflatex).
+# Run from the backend directory: python benchmarks/bench_pdf_service.py
+import copy
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATOR_DIR = os.path.join(os.path.dirname(BACKEND_DIR), 'resume_generator')
+sys.path.insert(0, os.path.join(GENERATOR_DIR, 'scripts'))
+os.chdir(BACKEND_DIR)
+
+from pdf_service import PdfService
+
+LATEX = os.getenv('LATEX', 'pdflatex')
+ROUNDS = 5
+PARALLEL_JOBS = 6
+
+def subprocess_render(yaml_path, name):
+    # What /api/generate-resume used to do, minus moving files around
+    subprocess.run([sys.executable, '-c', 'import yaml, re, argparse'], check=True)
+    service = PdfService(latex=LATEX, use_format=False)
+    with open(yaml_path, 'r') as file:
+        data = yaml.safe_load(file)
+    with tempfile.TemporaryDirectory() as directory:
+        service.render_pdf(data, os.path.join(directory, f'{name}.pdf'))
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+if __name__ == '__main__':
+    with open('new_resume.yaml', 'r') as file:
+        data = yaml.safe_load(file)
+
+    with tempfile.TemporaryDirectory() as directory:
+        format_dir = os.path.join(directory, 'formats')
+        full = PdfService(latex=LATEX, format_dir=format_dir, use_format=False)
+        warm = PdfService(latex=LATEX, format_dir=format_dir, max_workers=PARALLEL_JOBS)
+
+        start = time.perf_counter()
+        warm.render_pdf(data, os.path.join(directory, 'first.pdf'))
+        print(f"first render, building the preamble format: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        output = os.path.join(directory, 'out.pdf')
+        print(f"interpreter + full preamble per render:     {timed(subprocess_render, 'new_resume.yaml', 'old'):8.1f} ms")
+        print(f"in-process, full preamble:                   {timed(full.render_pdf, data, output):8.1f} ms")
+        print(f"in-process, precompiled preamble format:     {timed(warm.render_pdf, data, output):8.1f} ms")
+
+        # Each parallel job gets a distinct name and its own output file
+        def render(index):
+            job_data = copy.deepcopy(data)
+            job_data['information']['name'] = f'Candidate {index}'
+            pdf_path = os.path.join(directory, f'job_{index}.pdf')
+            tex_path = os.path.join(directory, f'job_{index}.tex')
+            warm.render_pdf(job_data, pdf_path, tex_path=tex_path)
+            with open(tex_path, 'r') as file:
+                return os.path.exists(pdf_path) and f'Candidate {index}' in file.read()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=PARALLEL_JOBS) as executor:
+            results = list(executor.map(render, range(PARALLEL_JOBS)))
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{PARALLEL_JOBS} parallel renders: {elapsed:.1f} ms, each with its own PDF: {all(results)}")
+        if not all(results):
+            sys.exit(1)
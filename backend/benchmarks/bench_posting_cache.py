@@ -0,0 +1,95 @@
+# Latency of /scrape-job-posting's fetch + extract step for a new link, a
+# repeat of the same link, a stale link revalidated with a 304, and a second
+# URL for the same posting, using JobPostingCache over a local HTTP server
+# that serves the saved fixtures with ETags. Gemini extraction is simulated
+# with a fixed latency.
+# Run from the backend directory: python benchmarks/bench_posting_cache.py
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from job_fetcher import fetch_job_posting
+from job_postings import format_posting, save_job_posting
+from posting_cache import JobPostingCache
+
+FIXTURE = os.path.join('benchmarks', 'fixtures', 'job_postings', 'ats_json_ld.html')
+EXTRACT_LATENCY = 2.0
+
+def start_server(body):
+    etag = '"' + hashlib.md5(body).hexdigest() + '"'
+    requests_seen = {'full': 0, 'not_modified': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.headers.get('If-None-Match') == etag:
+                requests_seen['not_modified'] += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            requests_seen['full'] += 1
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, requests_seen
+
+def fake_extract(text):
+    time.sleep(EXTRACT_LATENCY)
+    return {'Job Title': 'Software Engineer Intern', 'Company Name': 'Northwind Analytics',
+            'Job Description': text[:200], 'Required Skills': ['Python', 'Kubernetes'],
+            'Key Responsibilities': ['Build services'], 'Top 20 Keywords': ['python', 'ml']}
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+if __name__ == '__main__':
+    with open(FIXTURE, 'rb') as file:
+        server, requests_seen = start_server(file.read())
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    now = {'t': 0.0}
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = JobPostingCache(fetch_job_posting, fake_extract, os.path.join(directory, 'postings.sqlite3'),
+                                fresh_seconds=3600, clock=lambda: now['t'])
+        link = base + '/jobs/1234'
+
+        print(f"Gemini extraction simulated at {EXTRACT_LATENCY * 1000:.0f} ms")
+        elapsed, posting = timed(cache.get, link)
+        print(f"  new link                    {elapsed:9.1f} ms")
+        elapsed, _ = timed(cache.get, link)
+        print(f"  same link again             {elapsed:9.1f} ms")
+        now['t'] += 7200
+        elapsed, _ = timed(cache.get, link)
+        print(f"  stale link, 304 from origin {elapsed:9.1f} ms")
+        elapsed, _ = timed(cache.get, base + '/jobs/1234?utm_source=newsletter')
+        print(f"  other URL, same posting     {elapsed:9.1f} ms")
+        elapsed, path = timed(save_job_posting, posting, directory)
+        print(f"  save .json + .txt           {elapsed:9.1f} ms")
+
+        print(f"cache {cache.stats()}, origin requests {requests_seen}")
+        with open(path) as file:
+            if file.read() != format_posting(posting):
+                sys.exit(1)
+    server.shutdown()
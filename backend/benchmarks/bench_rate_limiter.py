@@ -0,0 +1,64 @@
+# Upload latency with the old fixed 3.5s sleep versus the shared token bucket,
+# measured against the local fake Gemini model, plus a check that the limiter
+# never lets calls exceed the configured quota.
+# Run from the backend directory: python benchmarks/bench_rate_limiter.py
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from fake_gemini import FakeGenerativeModel
+from rate_limiter import TokenBucket
+
+API_LATENCY = 0.4
+
+def upload(files, handle):
+    start = time.perf_counter()
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(handle, range(files)))
+    return time.perf_counter() - start
+
+def fixed_sleep_upload(files):
+    model = FakeGenerativeModel(latency=API_LATENCY)
+    def handle(index):
+        model.generate_content(['image', 'prompt'])
+        time.sleep(3.5)
+    return upload(files, handle)
+
+def limited_upload(files, limiter):
+    model = FakeGenerativeModel(latency=API_LATENCY)
+    def handle(index):
+        limiter.acquire()
+        model.generate_content(['image', 'prompt'])
+    return upload(files, handle), model.call_times
+
+def check_quota(call_times, requests_per_minute, burst):
+    # In any window of w seconds at most burst + w * rate calls may start
+    # (one call of slack for timer jitter)
+    rate = requests_per_minute / 60.0
+    call_times = sorted(call_times)
+    for i, first in enumerate(call_times):
+        for j in range(i, len(call_times)):
+            allowed = burst + (call_times[j] - first) * rate + 1e-6
+            if j - i + 1 > allowed + 1:
+                return False
+    return True
+
+if __name__ == '__main__':
+    files = 5
+    print(f"{files}-file upload, fake API latency {API_LATENCY * 1000:.0f} ms")
+    print(f"  fixed 3.5s sleep        {fixed_sleep_upload(files):6.2f} s")
+    elapsed, _ = limited_upload(files, TokenBucket(15))
+    print(f"  token bucket (15 rpm)   {elapsed:6.2f} s")
+
+    requests_per_minute, burst, calls = 600, 3, 30
+    elapsed, call_times = limited_upload(calls, TokenBucket(requests_per_minute, burst=burst))
+    ok = check_quota(call_times, requests_per_minute, burst)
+    expected = (calls - burst) / (requests_per_minute / 60.0)
+    print(f"{calls} calls at {requests_per_minute} rpm (burst {burst}): {elapsed:.2f} s, expected >= {expected:.2f} s, quota respected: {ok}")
+    if not ok:
+        sys.exit(1)
@@ -0,0 +1,91 @@
+# Reconstruct step: the old subprocess (`python reconstruct.py`, which
+# re-read every parsed resume YAML for every item it looked up) versus
+# reconstruct_files() in-process and reconstruct_resume() on in-memory
+# results, with the parsed resumes directory padded out to more files.
+# Run from the backend directory: python benchmarks/bench_reconstruct.py
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from reconstruct import ResumeIndex, load_parsed_resumes, parse_analysis, reconstruct_files, reconstruct_resume
+
+PARSED_DIR = os.path.join('parsed_resumes', '20240705_070212')
+ROUNDS = 5
+COPIES = [1, 10, 50]
+
+def find_matching_info(directory, item_type, item_name):
+    # The lookup reconstruct.py used to run per item
+    for filename in os.listdir(directory):
+        if filename.endswith('.yaml'):
+            with open(os.path.join(directory, filename), 'r') as file:
+                resume_data = yaml.safe_load(file)
+                if item_type in resume_data:
+                    for entry in resume_data[item_type]:
+                        if item_type == 'experience' and entry['company'] == item_name.split(':')[0].strip():
+                            return entry
+                        elif item_type == 'projects' and entry['title'] == item_name:
+                            return entry
+                        elif item_type == 'research' and item_name in str(entry['description']):
+                            return entry
+    return None
+
+def legacy_lookups(directory, selections):
+    for item_type, key in (('experience', 'experiences'), ('projects', 'projects'), ('research', 'research')):
+        for item in selections[key]:
+            find_matching_info(directory, item_type, item)
+
+def indexed_lookups(directory, selections):
+    index = ResumeIndex.from_directory(directory)
+    for item_type, key in (('experience', 'experiences'), ('projects', 'projects'), ('research', 'research')):
+        for item in selections[key]:
+            index.find(item_type, item)
+
+def padding_resume(i):
+    with open(os.path.join(PARSED_DIR, sorted(os.listdir(PARSED_DIR))[0]), 'r') as file:
+        resume = yaml.safe_load(file)
+    for section, key in (('experience', 'company'), ('projects', 'title'), ('research', 'description')):
+        for entry in resume.get(section) or []:
+            entry[key] = f'Padding {i} {entry[key]}'
+    return resume
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+if __name__ == '__main__':
+    with open('resume_analysis.txt', 'r') as file:
+        selections = parse_analysis(file.read())
+
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'new_resume.yaml')
+        for copies in COPIES:
+            # Padding resumes whose entries match nothing, so the old scan reads them all
+            parsed_dir = os.path.join(directory, f'parsed_{copies}')
+            os.makedirs(parsed_dir)
+            for filename in os.listdir(PARSED_DIR):
+                shutil.copy(os.path.join(PARSED_DIR, filename), parsed_dir)
+            for i in range(copies - 1):
+                resume = padding_resume(i)
+                with open(os.path.join(parsed_dir, f'padding_{i}.yaml'), 'w') as file:
+                    yaml.safe_dump(resume, file)
+            files = len(os.listdir(parsed_dir))
+
+            command = [sys.executable, 'reconstruct.py', '--analysis', 'resume_analysis.txt',
+                       '--parsed-dir', parsed_dir, '--output', output]
+            subprocess_time = timed(lambda: subprocess.run(command, stdout=subprocess.DEVNULL, check=True))
+            resumes = load_parsed_resumes(parsed_dir)
+            print(f"{files:3d} parsed files: lookups rescanning files {timed(legacy_lookups, parsed_dir, selections):8.2f} ms"
+                  f"   indexed {timed(indexed_lookups, parsed_dir, selections):7.2f} ms")
+            print(f"{'':16}subprocess {subprocess_time:8.2f} ms   reconstruct_files {timed(reconstruct_files, 'resume_analysis.txt', parsed_dir, output):7.2f} ms"
+                  f"   in memory {timed(reconstruct_resume, selections, resumes):6.3f} ms")
@@ -0,0 +1,52 @@
+# Compare the old rasterization (every page at pdf2image's 200 DPI default,
+# saved as PNG files) with render_pages on the PDFs in uploads/.
+# Run from the backend directory: python benchmarks/bench_render.py
+import glob
+import os
+import sys
+import tempfile
+import time
+
+from pdf2image import convert_from_path
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from pdf_parser import render_pages, RENDER_DPI, RENDER_GRAYSCALE
+
+def legacy_render(file_path, output_folder):
+    images = convert_from_path(file_path)
+    pixel_bytes = sum(len(image.getbands()) * image.width * image.height for image in images)
+    disk_bytes = 0
+    for i, image in enumerate(images):
+        image_file = os.path.join(output_folder, f'page_{i+1}.png')
+        image.save(image_file, 'PNG')
+        disk_bytes += os.path.getsize(image_file)
+    return pixel_bytes, disk_bytes
+
+def timed(func, *args):
+    start = time.process_time()
+    wall_start = time.perf_counter()
+    result = func(*args)
+    return time.process_time() - start, time.perf_counter() - wall_start, result
+
+if __name__ == '__main__':
+    pdfs = sorted(glob.glob(os.path.join('uploads', '*', '*.pdf')))
+    totals = {'legacy': [0.0, 0.0, 0, 0], 'selective': [0.0, 0.0, 0, 0]}
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        for pdf in pdfs:
+            cpu, wall, (pixel_bytes, disk_bytes) = timed(legacy_render, pdf, output_folder)
+            for i, value in enumerate((cpu, wall, pixel_bytes, disk_bytes)):
+                totals['legacy'][i] += value
+
+            cpu, wall, pages = timed(render_pages, pdf)
+            pixel_bytes = sum(len(page) for page in pages)
+            for i, value in enumerate((cpu, wall, pixel_bytes, 0)):
+                totals['selective'][i] += value
+
+    print(f"{len(pdfs)} PDFs; selective mode: first page, {RENDER_DPI} DPI, grayscale={RENDER_GRAYSCALE}")
+    for label, (cpu, wall, memory, disk) in totals.items():
+        memory_label = 'raw pixels' if label == 'legacy' else 'PNG bytes'
+        print(f"  {label:<10} cpu {cpu:6.2f} s  wall {wall:6.2f} s  in memory {memory / 1e6:7.1f} MB ({memory_label})  written to disk {disk / 1e6:6.1f} MB")
@@ -0,0 +1,62 @@
+# Compare per-item scoring (keyword vector re-transformed for every item) with
+# the batched ScoringContext, on every parsed resume in parsed_resumes/.
+# Run from the backend directory: python benchmarks/bench_scoring.py
+import glob
+import os
+import sys
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import model
+
+def legacy_score(texts, keywords, vectorizer):
+    # The previous calculate_relevance: two transforms and one cosine per item
+    scores = []
+    for text in texts:
+        item_vector = vectorizer.transform([text])
+        keywords_vector = vectorizer.transform([' '.join(keywords)])
+        scores.append(cosine_similarity(item_vector, keywords_vector)[0][0])
+    return scores
+
+def collect_texts(resumes, job_description):
+    texts = []
+    for _, resume in resumes:
+        for section in ('experience', 'projects', 'research'):
+            texts.extend(model.get_item_text(item) for item in resume.get(section) or [])
+        for skills in resume.get('technical-skills', {}).values():
+            for skill in str(skills).split(', '):
+                texts.append(model.get_item_text(model.expand_skill(skill, job_description)[0]))
+    return texts
+
+if __name__ == '__main__':
+    model.ensure_nltk_data()
+    resumes = []
+    for resume_dir in glob.glob(os.path.join('parsed_resumes', '*')):
+        resumes.extend(model.load_resumes(resume_dir))
+    job_path = sorted(glob.glob(os.path.join('job_postings', '*', '*.txt')))[-1]
+    job_description = model.load_job_description(job_path)
+
+    keywords = model.extract_keywords(job_description)
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit([job_description])
+    texts = collect_texts(resumes, job_description)
+
+    start = time.perf_counter()
+    legacy_scores = legacy_score(texts, keywords, vectorizer)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    context = model.ScoringContext(keywords, vectorizer)
+    batched_scores = context.score_texts(texts)
+    batched = time.perf_counter() - start
+
+    max_diff = max(abs(a - b) for a, b in zip(legacy_scores, batched_scores))
+    print(f"Resumes: {len(resumes)}  items: {len(texts)}  max score difference: {max_diff:.2e}")
+    print(f"per-item scoring   {legacy * 1000:8.1f} ms")
+    print(f"batched context    {batched * 1000:8.1f} ms   ({legacy / batched:.1f}x)")
@@ -0,0 +1,78 @@
+# Compare the precompiled taxonomy matcher with the old per-keyword substring scan.
+# Run from the backend directory: python benchmarks/bench_taxonomy.py
+import glob
+import os
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import model
+from taxonomy import CATEGORY_TAXONOMY
+
+def legacy_related_terms(item):
+    # The previous get_related_terms: lowercase the text again for every keyword
+    # of every category and test each keyword with a substring scan
+    related_terms = []
+    for category in CATEGORY_TAXONOMY:
+        keywords = list(category['keywords'])
+        high_priority = list(category['high_priority'])
+        base_score = sum(keyword.lower() in str(item).lower() for keyword in keywords)
+        priority_score = sum(word.lower() in str(item).lower() for word in high_priority) * 2
+        if base_score + priority_score > 0:
+            related_terms.extend(category['related_terms'])
+    return related_terms
+
+def load_samples():
+    samples = []
+    for path in glob.glob(os.path.join('parsed_resumes', '*', '*.yaml')):
+        resume = model.load_yaml(path)
+        for section in ('experience', 'projects', 'research'):
+            samples.extend(resume.get(section) or [])
+        for skills in resume.get('technical-skills', {}).values():
+            samples.extend(str(skills).split(', '))
+    for path in glob.glob(os.path.join('job_postings', '*', '*.txt')):
+        samples.extend(re.findall(r'\w+', model.load_job_description(path).lower()))
+    return samples
+
+def time_calls(func, samples, rounds=3):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for sample in samples:
+            func(sample)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def time_main(engine, rounds=3):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        model.main(engine)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == '__main__':
+    samples = load_samples()
+    mismatches = sum(legacy_related_terms(s) != model.get_related_terms(s) for s in samples)
+    print(f"Samples: {len(samples)}  mismatches: {mismatches}")
+
+    legacy = time_calls(legacy_related_terms, samples)
+    compiled = time_calls(model.get_related_terms, samples)
+    print(f"per call   legacy {legacy / len(samples) * 1e6:8.1f} us   compiled {compiled / len(samples) * 1e6:8.1f} us   ({legacy / compiled:.1f}x)")
+
+    engine = model.ScoringEngine()
+    model.main(engine)  # warm up sklearn before timing
+    compiled_main = time_main(engine)
+    original = model.get_related_terms
+    model.get_related_terms = legacy_related_terms
+    try:
+        legacy_main = time_main(engine)
+    finally:
+        model.get_related_terms = original
+    print(f"main()     legacy {legacy_main * 1000:8.1f} ms   compiled {compiled_main * 1000:8.1f} ms   ({legacy_main / compiled_main:.1f}x)")
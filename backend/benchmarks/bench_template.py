@@ -0,0 +1,103 @@
+# Render time of the compiled template renderer versus the old
+# replace_placeholders (one re.sub over the whole template per YAML scalar,
+# two DOTALL section-stripping passes per list) on new_resume.yaml, and on
+# the same resume with every list padded out, to show how each scales with
+# resume length. The old function runs against the indexed template it was
+# written for, saved in benchmarks/fixtures/template_indexed.tex.
+# Run from the backend directory: python benchmarks/bench_template.py
+import copy
+import os
+import re
+import sys
+import time
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATOR_DIR = os.path.join(os.path.dirname(BACKEND_DIR), 'resume_generator')
+sys.path.insert(0, os.path.join(GENERATOR_DIR, 'scripts'))
+os.chdir(BACKEND_DIR)
+
+from template_renderer import Template, escape_latex, load_template
+
+ROUNDS = 50
+
+def replace_placeholders(template, data, prefix=''):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            template = replace_placeholders(template, value, prefix + key + '.')
+    elif isinstance(data, list):
+        for i, item in enumerate(data):
+            if isinstance(item, dict):
+                # Check if any required fields are null for experiences or projects
+                if 'experience' in prefix:
+                    if not all([item.get('company'), item.get('title'), item.get('dates'), item.get('location')]):
+                        continue
+                elif 'projects' in prefix:
+                    if not all([item.get('title'), item.get('date')]):
+                        continue
+            template = replace_placeholders(template, item, f"{prefix}{i}.")
+        # Remove entire sections for non-existent list items
+        template = re.sub(r'\\resumeSubheading\s*{{{' + re.escape(prefix) + r'\d+\..*?}}}{.*?}\s*{.*?}{.*?}\s*\\resumeItemListStart.*?\\resumeItemListEnd', '', template, flags=re.DOTALL)
+        # Remove individual \resumeItem lines for non-existent list items
+        template = re.sub(r'\\resumeItem\{{{' + re.escape(prefix) + r'\d+\..*?}}}\n?', '', template)
+    else:
+        # Escape special characters for LaTeX
+        escaped_value = re.sub(r'([&%$#_{}])', r'\\\1', str(data))
+        # Replace placeholders with the escaped value
+        placeholder = '{{' + prefix.rstrip('.') + '}}'
+        template = re.sub(re.escape(placeholder), escaped_value, template)
+    return template
+
+def padded(data, entries, bullets):
+    # The same resume with longer lists, as a longer source resume would give
+    data = copy.deepcopy(data)
+    for section in ('experience', 'research', 'projects'):
+        items = data.get(section) or []
+        if not items:
+            continue
+        data[section] = [copy.deepcopy(items[i % len(items)]) for i in range(entries)]
+        for item in data[section]:
+            lines = item.get('description') or ['']
+            item['description'] = [lines[i % len(lines)] for i in range(bullets)]
+    return data
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1000, result
+
+def rendered_values(data, limits):
+    # Every scalar the new template shows for this data, LaTeX-escaped
+    values = [data['information']['name'], data['education']['school'], data['technical-skills']['languages']]
+    for section, (entries, bullets) in limits.items():
+        for item in (data.get(section) or [])[:entries]:
+            values.extend(item['description'][:bullets])
+    return [escape_latex(value) for value in values]
+
+if __name__ == '__main__':
+    with open('new_resume.yaml', 'r') as file:
+        data = yaml.safe_load(file)
+    with open(os.path.join('benchmarks', 'fixtures', 'template_indexed.tex'), 'r') as file:
+        indexed_template = file.read()
+    template_path = os.path.join(GENERATOR_DIR, 'templates', 'template.tex')
+    with open(template_path, 'r') as file:
+        template_source = file.read()
+
+    compile_time, template = timed(Template, template_source)
+    load_template(template_path)
+    cached_time, _ = timed(load_template, template_path)
+    print(f"compile template.tex once: {compile_time:.3f} ms (cached lookup {cached_time:.4f} ms)")
+
+    limits = {'experience': (4, 6), 'research': (1, 4), 'projects': (2, 4)}
+    cases = [('new_resume.yaml', data), ('10 entries x 8 bullets', padded(data, 10, 8)),
+             ('40 entries x 12 bullets', padded(data, 40, 12))]
+    for label, case in cases:
+        legacy_time, _ = timed(replace_placeholders, indexed_template, case)
+        compiled_time, output = timed(template.render, case)
+        missing = [value for value in rendered_values(case, limits) if value not in output]
+        print(f"{label:<26} replace_placeholders {legacy_time:8.3f} ms   compiled render {compiled_time:7.3f} ms"
+              f"   ({legacy_time / compiled_time:5.1f}x){'   MISSING VALUES' if missing else ''}")
+        if missing:
+            sys.exit(1)
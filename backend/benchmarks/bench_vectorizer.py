@@ -0,0 +1,93 @@
+# Per-request scoring latency with a TfidfVectorizer fitted on the one job
+# description (the old ScoringEngine.score()) versus the shared, persisted
+# JobVectorizer that each request only transforms with, plus stability
+# checks: scores are identical after reloading the vectorizer from disk and
+# don't depend on what else was scored first, how many resume terms the
+# per-job vocabulary used to drop, and how many of the old top items are
+# still picked.
+# Run from the backend directory: python benchmarks/bench_vectorizer.py
+import glob
+import os
+import sys
+import tempfile
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import model
+from job_vectorizer import JobVectorizer, load_corpus
+
+PARSED_DIR = os.path.join('parsed_resumes', '20240705_070212')
+ROUNDS = 20
+ITEM_SECTIONS = ('experiences', 'projects', 'involvements', 'courseworks', 'research')
+
+def legacy_score(resumes, job_description):
+    # The old ScoringEngine.score(): a vectorizer fitted on this job alone
+    keywords = model.extract_keywords(job_description)
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit([job_description])
+    context = model.ScoringContext(keywords, vectorizer)
+    return model.merge_results([(name, model.process_resume(resume, job_description, context)) for name, resume in resumes])
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1000, result
+
+def flatten(results):
+    return [(section, str(entry['item']), entry['score'])
+            for section, entries in model.results_to_dict(results).items() for entry in entries]
+
+def dropped_terms(resumes, job_description):
+    # Share of resume item terms outside the job's own vocabulary
+    analyzer = TfidfVectorizer().build_analyzer()
+    job_terms = set(analyzer(job_description))
+    terms = [term for _, resume in resumes for section, items, _ in model.resume_sections(resume)[0]
+             for item in items for term in analyzer(model.get_item_text(item))]
+    return sum(term not in job_terms for term in terms) / max(len(terms), 1)
+
+if __name__ == '__main__':
+    corpus = load_corpus('job_postings')
+    jobs = [text for path in sorted(glob.glob(os.path.join('benchmarks', 'fixtures', 'job_postings', '*.html')))
+            for text in [open(path).read()]] + corpus
+    resumes = model.load_resumes(PARSED_DIR)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'job_vectorizer.npz')
+        start = time.perf_counter()
+        fitted = JobVectorizer.fit(corpus)
+        fitted.save(path)
+        fit_time = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        loaded = JobVectorizer.load(path)
+        load_time = (time.perf_counter() - start) * 1000
+        print(f"fit on {len(corpus)} postings and save: {fit_time:.1f} ms   load once per worker: {load_time:.1f} ms")
+
+        engine = model.ScoringEngine(loaded)
+        job = corpus[-1]
+        legacy_time, legacy = timed(legacy_score, resumes, job)
+        shared_time, shared = timed(engine.score, resumes, job)
+        print(f"per request: fit per job {legacy_time:7.2f} ms   shared vectorizer {shared_time:7.2f} ms")
+
+        # Stability: the same scores from the in-memory and reloaded
+        # vectorizer, and before and after scoring other jobs
+        first = flatten(model.ScoringEngine(fitted).score(resumes, job))
+        for other in jobs:
+            engine.score(resumes, other)
+        stable = first == flatten(shared) == flatten(engine.score(resumes, job))
+        print(f"identical scores after reload and after scoring {len(jobs)} other jobs: {stable}")
+
+        for index, text in enumerate(jobs):
+            old, new = legacy_score(resumes, text), engine.score(resumes, text)
+            kept = sum(len({str(item) for item, _ in old[section]} & {str(item) for item, _ in new[section]})
+                       for section in ITEM_SECTIONS)
+            total = sum(len(old[section]) for section in ITEM_SECTIONS)
+            print(f"  job {index}: resume terms the per-job vocabulary dropped {dropped_terms(resumes, text):5.1%}"
+                  f"   old top items still picked {kept}/{total}")
+        if not stable:
+            sys.exit(1)
@@ -0,0 +1,65 @@
+# Scores validated resumes that leave out optional fields. validate_resume()
+# keeps a missing or blank optional field as None, so every scoring path
+# (ScoringEngine.score, batch_scoring.score_jobs, CandidateIndex) and
+# reconstruct have to cope with None involvement, coursework and skills.
+# Exits non-zero on the first path that fails.
+# Run from the backend directory: python benchmarks/check_optional_fields.py
+import glob
+import os
+import sys
+import tempfile
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import model
+from batch_scoring import score_jobs
+from candidate_index import CandidateIndex
+from reconstruct import reconstruct_resume, selections_from_results
+from resume_schema import validate_resume
+
+PARSED_DIR = os.path.join('parsed_resumes', '20240705_070212')
+
+def sparse_resumes():
+    # The sample resumes with their optional list fields blanked or left out
+    samples = model.load_resumes(PARSED_DIR)
+    for i, (name, resume) in enumerate(samples):
+        resume['education']['involvement'] = ''
+        resume['education'].pop('relevant-coursework', None)
+        skills = resume['technical-skills']
+        skills['developer-tools'] = ''
+        skills.pop('additional-skills', None)
+        if i % 2:
+            skills.pop('technologies', None)
+        yield f'sparse_{name}', validate_resume(resume)
+
+if __name__ == '__main__':
+    engine = model.ScoringEngine()
+    job_description = model.load_job_description(sorted(glob.glob(os.path.join('job_postings', '*', '*.txt')))[-1])
+    resumes = list(sparse_resumes())
+    assert resumes[0][1]['education']['involvement'] is None
+
+    results = engine.score(resumes, job_description)
+    print(f"ScoringEngine.score: {len(resumes)} resumes, {len(results['experiences'])} experiences picked")
+
+    batch = score_jobs(resumes, [job_description], workers=1)[0]
+    same = model.results_to_dict(batch) == model.results_to_dict(results)
+    print(f"batch_scoring.score_jobs: same results: {same}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        parsed_dir = os.path.join(directory, 'parsed')
+        os.makedirs(parsed_dir)
+        for name, resume in resumes:
+            with open(os.path.join(parsed_dir, name), 'w') as file:
+                yaml.safe_dump(resume, file)
+        index = CandidateIndex(os.path.join(directory, 'index.sqlite3'))
+        index.sync(parsed_dir)
+        print(f"CandidateIndex.rank: {len(index.rank(job_description))} candidates")
+
+    new_resume = reconstruct_resume(selections_from_results(results), resumes)
+    print(f"reconstruct_resume: {len(new_resume['experience'])} experiences")
+    if not same:
+        sys.exit(1)
@@ -0,0 +1,61 @@
+# Diffs the text reports model.py writes (resume_analysis.txt and
+# individual_resume_analysis.txt) between two revisions of the backend, to
+# check that a refactor leaves the scoring output unchanged. Each side is
+# exported to a temp directory and runs `python model.py` on the checked-in
+# sample workspace (run_timestamp_*.txt). Prints SAME, or the differences
+# and exits non-zero.
+# Run from the backend directory: python benchmarks/compare_reports.py OLD [NEW]
+# OLD and NEW are git revisions; NEW defaults to the working tree.
+import difflib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+REPORTS = ['resume_analysis.txt', 'individual_resume_analysis.txt']
+SKIPPED = shutil.ignore_patterns('__pycache__', 'cache', 'runs', 'build', 'node_modules')
+
+def export(revision, directory):
+    # The backend as of revision, or as it is on disk for None
+    if revision is None:
+        shutil.copytree(BACKEND_DIR, directory, ignore=SKIPPED)
+        return
+    archive = subprocess.run(['git', 'archive', '--format=tar', revision, '.'], capture_output=True,
+                             check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+
+def reports(revision, directory):
+    export(revision, directory)
+    subprocess.run([sys.executable, 'model.py'], cwd=directory, stdout=subprocess.DEVNULL, check=True)
+    contents = {}
+    for name in REPORTS:
+        with open(os.path.join(directory, name)) as file:
+            contents[name] = file.read().splitlines(keepends=True)
+    return contents
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit('usage: python benchmarks/compare_reports.py OLD [NEW]')
+    old_revision = sys.argv[1]
+    new_revision = sys.argv[2] if len(sys.argv) > 2 else None
+
+    with tempfile.TemporaryDirectory() as directory:
+        old = reports(old_revision, os.path.join(directory, 'old'))
+        new = reports(new_revision, os.path.join(directory, 'new'))
+
+    new_label = new_revision or 'working tree'
+    differences = [line for name in REPORTS
+                   for line in difflib.unified_diff(old[name], new[name], f'{old_revision}/{name}',
+                                                    f'{new_label}/{name}')]
+    if differences:
+        sys.stdout.writelines(differences)
+        sys.exit(1)
+    print(f"SAME: {', '.join(REPORTS)} from {old_revision} and {new_label}")
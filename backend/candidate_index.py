@@ -0,0 +1,250 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import yaml
+from scipy.sparse import csr_matrix
+
+from job_vectorizer import get_job_vectorizer
+from model import (DIRECT_MATCH_BOOST, ScoringEngine, assemble_results, extend_skill, extract_keywords,
+                   get_item_text, load_job_description, resume_sections)
+
+# Candidate ranking: many parsed resumes against one job posting.
+#
+# Every resume item (experiences, projects, involvements, coursework,
+# research and skills) is turned into hashed term counts (job_vectorizer.py)
+# once, when its file is added, and kept in sqlite together with the
+# resume. The IDF weighting is applied when the index is loaded, so refitting
+# the vectorizer doesn't invalidate stored counts. A job is then one query
+# against the whole index, score = items @ keywords, the same cosine
+# ScoringEngine.score() gives for the resume on its own.
+#
+# A candidate is ranked by the mean score of the items score() would pick
+# from their resume (the top experiences, projects, involvements, courseworks
+# and research); skills are reported but not ranked on, as their direct-match
+# boost would swamp the item scores.
+
+INDEX_VERSION = '2'
+
+
+class CandidateIndex:
+    def __init__(self, db_path, vectorizer=None):
+        self.db_path = db_path
+        self.vectorizer = vectorizer or get_job_vectorizer()
+        self.added = 0
+        self.removed = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._entries = None
+        self._stacked = None
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            version = f'{INDEX_VERSION}:{self.vectorizer.n_features}'
+            row = self._connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != version:
+                # Counts from another item-text format or feature space can't be mixed in; start over
+                self._connection.execute('DROP TABLE IF EXISTS terms')
+                self._connection.execute('DROP TABLE IF EXISTS resumes')
+                self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,))
+            self._connection.execute('CREATE TABLE IF NOT EXISTS resumes (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, '
+                                     'size INTEGER NOT NULL, content_hash TEXT NOT NULL, resume TEXT NOT NULL, '
+                                     'lengths BLOB NOT NULL, term_ids BLOB NOT NULL, counts BLOB NOT NULL, '
+                                     'match_words TEXT NOT NULL)')
+            self._connection.commit()
+        return self._connection
+
+    def _load(self):
+        # Reads the stored vectors once per process
+        if self._entries is not None:
+            return
+        connection = self._connect()
+        self._entries = {}
+        for row in connection.execute('SELECT path, mtime_ns, size, content_hash, resume, lengths, term_ids, counts, '
+                                      'match_words FROM resumes'):
+            path, mtime_ns, size, content_hash, resume, lengths, term_ids, counts, match_words = row
+            self._entries[path] = self._entry(mtime_ns, size, content_hash, json.loads(resume),
+                                              np.frombuffer(lengths, dtype=np.int32),
+                                              np.frombuffer(term_ids, dtype=np.int32),
+                                              np.frombuffer(counts, dtype=np.int32), json.loads(match_words))
+
+    @staticmethod
+    def _entry(mtime_ns, size, content_hash, resume, lengths, term_ids, counts, match_words):
+        item_sections, skill_sections = resume_sections(resume)
+        return {'mtime_ns': mtime_ns, 'size': size, 'content_hash': content_hash, 'resume': resume,
+                'item_sections': item_sections, 'skill_sections': skill_sections,
+                'lengths': lengths, 'term_ids': term_ids, 'counts': counts, 'match_words': match_words}
+
+    def _vectorize(self, resume):
+        # Term counts of every item and extended skill, in resume_sections() order
+        item_sections, skill_sections = resume_sections(resume)
+        texts = [get_item_text(item) for _, items, _ in item_sections for item in items]
+        match_words = []
+        for _, skills in skill_sections:
+            for skill in skills:
+                extended_skill, words = extend_skill(skill)
+                texts.append(get_item_text(extended_skill))
+                match_words.append(words)
+
+        counts = self.vectorizer.counts(texts).tocsr()
+        return (np.diff(counts.indptr).astype(np.int32), counts.indices.astype(np.int32),
+                counts.data.astype(np.int32), match_words)
+
+    def sync(self, directory):
+        # Brings the index up to date with a directory of parsed resumes:
+        # new and changed files are vectorized, unchanged ones skipped and
+        # removed ones dropped. Returns how many files were (re)indexed.
+        directory = os.path.normpath(directory)
+        filenames = sorted(name for name in os.listdir(directory) if name.endswith('.yaml'))
+        indexed = 0
+        with self._lock:
+            self._load()
+            connection = self._connect()
+            try:
+                paths = set()
+                for filename in filenames:
+                    path = os.path.join(directory, filename)
+                    paths.add(path)
+                    stat = os.stat(path)
+                    entry = self._entries.get(path)
+                    if entry and (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    with open(path, 'rb') as file:
+                        raw = file.read()
+                    content_hash = hashlib.sha256(raw).hexdigest()
+                    if entry and entry['content_hash'] == content_hash:
+                        entry['mtime_ns'], entry['size'] = stat.st_mtime_ns, stat.st_size
+                        connection.execute('UPDATE resumes SET mtime_ns = ?, size = ? WHERE path = ?',
+                                           (stat.st_mtime_ns, stat.st_size, path))
+                        continue
+
+                    resume = yaml.safe_load(raw) or {}
+                    resume = json.loads(json.dumps(resume, default=str))  # stored and returned as JSON
+                    lengths, term_ids, counts, match_words = self._vectorize(resume)
+                    connection.execute('INSERT OR REPLACE INTO resumes (path, mtime_ns, size, content_hash, resume, lengths, '
+                                       'term_ids, counts, match_words) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                       (path, stat.st_mtime_ns, stat.st_size, content_hash, json.dumps(resume),
+                                        lengths.tobytes(), term_ids.tobytes(), counts.tobytes(), json.dumps(match_words)))
+                    self._entries[path] = self._entry(stat.st_mtime_ns, stat.st_size, content_hash, resume,
+                                                      lengths, term_ids, counts, match_words)
+                    self._stacked = None
+                    indexed += 1
+
+                for path in [path for path in self._entries if os.path.dirname(path) == directory and path not in paths]:
+                    connection.execute('DELETE FROM resumes WHERE path = ?', (path,))
+                    del self._entries[path]
+                    self._stacked = None
+                    self.removed += 1
+                connection.commit()
+            except Exception:
+                # Drop the half-applied in-memory state; the next call reloads it
+                connection.rollback()
+                self._entries = self._stacked = None
+                raise
+            self.added += indexed
+        return indexed
+
+    def _stack(self):
+        # All item vectors as one matrix, rebuilt only after the index changes
+        if self._stacked is not None:
+            return self._stacked
+        paths = sorted(self._entries)
+        entries = [self._entries[path] for path in paths]
+        lengths = np.concatenate([entry['lengths'] for entry in entries] or [np.zeros(0, dtype=np.int32)])
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        term_ids = np.concatenate([entry['term_ids'] for entry in entries] or [np.zeros(0, dtype=np.int32)])
+        counts = np.concatenate([entry['counts'] for entry in entries] or [np.zeros(0, dtype=np.int32)])
+        items = csr_matrix((counts.astype(np.float64), term_ids, indptr), shape=(len(lengths), self.vectorizer.n_features))
+        items = self.vectorizer.weight(items)
+
+        # Skill match words as a (skills x distinct words) matrix, for the direct-match boost
+        words = {}
+        rows, columns = [], []
+        skill = 0
+        offsets = []
+        item_offset = 0
+        for entry in entries:
+            offsets.append((item_offset, skill))
+            item_offset += len(entry['lengths'])
+            for match_words in entry['match_words']:
+                for word in match_words:
+                    rows.append(skill)
+                    columns.append(words.setdefault(word, len(words)))
+                skill += 1
+        skill_words = csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(skill, len(words)))
+        self._stacked = (paths, entries, offsets, items, list(words), skill_words)
+        return self._stacked
+
+    def score_items(self, job_description):
+        # Scores of every indexed item and skill boost for this job
+        keywords = extract_keywords(job_description)
+        with self._lock:
+            self._load()
+            paths, entries, offsets, items, words, skill_words = self._stack()
+
+        keywords_vector = self.vectorizer.transform([' '.join(keywords)])
+        scores = (items @ keywords_vector.T).toarray()[:, 0]
+
+        job_text = job_description.lower()
+        present = np.array([word in job_text for word in words], dtype=np.float64)
+        boosts = (skill_words @ present > 0) * DIRECT_MATCH_BOOST
+        return paths, entries, offsets, scores, boosts
+
+    def rank(self, job_description, top_n=10):
+        # The top_n candidates for the job, best first, each with its score
+        # and the per-resume results ScoringEngine.score() would report
+        paths, entries, offsets, scores, boosts = self.score_items(job_description)
+        ranked = []
+        for path, entry, (item_offset, skill_offset) in zip(paths, entries, offsets):
+            selected = []
+            position = item_offset
+            for section, items, section_top_n in entry['item_sections']:
+                section_scores = scores[position:position + len(items)]
+                selected.extend(np.sort(section_scores)[::-1][:section_top_n])
+                position += len(items)
+            ranked.append((float(np.mean(selected)) if selected else 0.0, path, entry, item_offset, skill_offset))
+        ranked.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        candidates = []
+        for score, path, entry, item_offset, skill_offset in ranked[:top_n]:
+            end = item_offset + len(entry['lengths'])
+            results = assemble_results(entry['item_sections'], entry['skill_sections'],
+                                       iter(scores[item_offset:end]),
+                                       iter(boosts[skill_offset:skill_offset + len(entry['match_words'])]))
+            candidates.append({'path': path, 'score': score, 'results': results})
+        return candidates
+
+    def stats(self):
+        with self._lock:
+            self._load()
+            return {'resumes': len(self._entries), 'added': self.added, 'removed': self.removed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rank indexed resumes against a job posting.')
+    parser.add_argument('--job', required=True, help='Path to the job posting text')
+    parser.add_argument('--parsed-dir', action='append', default=[], help='Directory of parsed resumes to index first')
+    parser.add_argument('--index', default=os.getenv('CANDIDATE_INDEX_PATH', os.path.join('cache', 'candidate_index.sqlite3')),
+                        help='Path of the index database')
+    parser.add_argument('--top', type=int, default=10, help='Number of candidates to show')
+    args = parser.parse_args(argv)
+
+    ScoringEngine()  # NLTK data
+    index = CandidateIndex(args.index)
+    for directory in args.parsed_dir:
+        print(f"Indexed {index.sync(directory)} new or changed resumes from {directory}")
+    for rank, candidate in enumerate(index.rank(load_job_description(args.job), args.top), 1):
+        experiences = ', '.join(exp['company'] for exp, _ in candidate['results']['experiences'])
+        print(f"{rank:3d}. {candidate['score']:.3f}  {candidate['path']}  ({experiences})")
+
+if __name__ == "__main__":
+    main()
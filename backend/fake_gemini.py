@@ -0,0 +1,48 @@
+import threading
+import time
+
+
+# Minimal offline stand-ins for google.generativeai, shaped like the parts of
+# the real responses the backend reads (response.candidates[0].content.parts[0].text).
+class FakePart:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeContent:
+    def __init__(self, text):
+        self.parts = [FakePart(text)]
+
+
+class FakeCandidate:
+    def __init__(self, text):
+        self.content = FakeContent(text)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.candidates = [FakeCandidate(text)]
+        self.text = text
+
+
+class FakeGenerativeModel:
+    # Returns a canned reply after a fixed latency and records when each call
+    # started, so callers can check request spacing against a quota
+    def __init__(self, model_name='gemini-1.5-flash', reply='```\n{}\n```', latency=0.0):
+        self.model_name = model_name
+        self.reply = reply
+        self.latency = latency
+        self.call_times = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, contents, **kwargs):
+        with self._lock:
+            self.call_times.append(time.monotonic())
+        if self.latency:
+            time.sleep(self.latency)
+        reply = self.reply(contents) if callable(self.reply) else self.reply
+        return FakeResponse(reply)
+
+
+def fake_upload_file(path, display_name=None, **kwargs):
+    return {'path': path, 'display_name': display_name}
@@ -0,0 +1,107 @@
+import io
+import os
+import random
+import threading
+import time
+import google.generativeai as genai
+from google.api_core import exceptions as api_exceptions
+from rate_limiter import gemini_limiter
+from fake_gemini import FakeGenerativeModel, fake_upload_file
+from dotenv import load_dotenv
+load_dotenv()
+
+# One Gemini client for the whole backend. genai keeps a single transport per
+# process once configured; on top of that the client caches model objects,
+# sends small images inline instead of through a separate upload, bounds the
+# number of requests in flight, and retries transient failures with backoff.
+
+GEMINI_MODEL_NAME = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+
+# Images up to this size go inline with the request; larger ones use the
+# File API. Inline requests are capped at 20 MB in total.
+INLINE_IMAGE_BYTES = int(os.getenv('GEMINI_INLINE_IMAGE_BYTES', str(4 * 1024 * 1024)))
+
+# Errors worth another attempt: quota, overload and timeouts
+TRANSIENT_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.InternalServerError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class GeminiClient:
+    def __init__(self, model_factory=genai.GenerativeModel, upload=genai.upload_file, limiter=gemini_limiter,
+                 max_concurrency=4, timeout=60.0, retries=3, backoff=1.0, max_backoff=20.0, sleep=time.sleep):
+        self.model_factory = model_factory
+        self.upload = upload
+        self.limiter = limiter
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.retried = 0
+        self._models = {}
+        self._models_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def model(self, model_name=None):
+        model_name = model_name or GEMINI_MODEL_NAME
+        with self._models_lock:
+            if model_name not in self._models:
+                self._models[model_name] = self.model_factory(model_name)
+            return self._models[model_name]
+
+    def image_part(self, data, mime_type='image/png', display_name=None):
+        # Inline image data saves the upload round trip for anything small
+        if len(data) <= INLINE_IMAGE_BYTES:
+            return {'mime_type': mime_type, 'data': data}
+        return self.upload(path=io.BytesIO(data), mime_type=mime_type, display_name=display_name)
+
+    def _delay(self, attempt):
+        # Exponential backoff with jitter so parallel callers don't retry in step
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def generate(self, contents, model_name=None):
+        # Returns the raw response. Every attempt takes a token from the shared
+        # quota and a concurrency slot; only transient errors are retried.
+        model = self.model(model_name)
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                with self._slots:
+                    return model.generate_content(contents, request_options={'timeout': self.timeout})
+            except TRANSIENT_ERRORS as e:
+                if attempt == self.retries:
+                    raise
+                delay = self._delay(attempt)
+                self.retried += 1
+                print(f"Gemini request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                self.sleep(delay)
+
+    def generate_text(self, contents, model_name=None):
+        response = self.generate(contents, model_name)
+        return response.candidates[0].content.parts[0].text
+
+
+def create_client():
+    # GEMINI_BACKEND=fake swaps in the offline fake model, for running the
+    # backend and the benchmarks without an API key
+    options = {
+        'max_concurrency': int(os.getenv('GEMINI_MAX_CONCURRENCY', '4')),
+        'timeout': float(os.getenv('GEMINI_TIMEOUT', '60')),
+        'retries': int(os.getenv('GEMINI_RETRIES', '3')),
+    }
+    if os.getenv('GEMINI_BACKEND', 'google') == 'fake':
+        latency = float(os.getenv('FAKE_GEMINI_LATENCY', '0'))
+        return GeminiClient(model_factory=lambda name: FakeGenerativeModel(name, latency=latency),
+                            upload=fake_upload_file, **options)
+
+    genai.configure(api_key=os.getenv('API_KEY_NAME'))
+    return GeminiClient(**options)
+
+gemini = create_client()
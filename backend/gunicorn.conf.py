@@ -0,0 +1,25 @@
+import os
+
+# Gunicorn settings, read automatically when gunicorn is started from the
+# backend directory: gunicorn (app and options come from here).
+#
+# Pipeline jobs (jobs.JobQueue) keep their status, results and event stream
+# in the memory of the process that queued them, so every /api/jobs/<id>
+# poll and event stream has to reach that same process. The server therefore
+# runs as ONE worker process and gets its concurrency from threads; the
+# scoring engine, caches and PDF service are shared by those threads too.
+
+wsgi_app = 'wsgi:app'
+workers = 1
+worker_class = 'gthread'
+# Each open /api/jobs/<id>/events stream holds a thread for its lifetime
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+
+
+def on_starting(server):
+    # A --workers flag or GUNICORN_CMD_ARGS would split jobs across processes
+    if server.cfg.workers != 1:
+        server.log.warning('Pipeline jobs live in process memory; running 1 worker instead of %s '
+                           '(raise GUNICORN_THREADS for more concurrency)', server.cfg.workers)
+        server.cfg.set('workers', 1)
+        server.num_workers = 1
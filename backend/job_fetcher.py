@@ -0,0 +1,284 @@
+import json
+import os
+import re
+import time
+from html.parser import HTMLParser
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Fetches job postings over one pooled HTTP session and reduces the page to
+# the text worth sending to Gemini. Slow hosts are cut off by the connect and
+# read timeouts, hosts that trickle the body by the overall download
+# deadline, oversized pages by the byte budget.
+
+CONNECT_TIMEOUT = float(os.getenv('JOB_FETCH_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('JOB_FETCH_READ_TIMEOUT', '15'))
+# The read timeout applies to each socket read; this bounds the whole body
+DOWNLOAD_TIMEOUT = float(os.getenv('JOB_FETCH_DOWNLOAD_TIMEOUT', '30'))
+MAX_FETCH_BYTES = int(os.getenv('JOB_FETCH_MAX_BYTES', str(2 * 1024 * 1024)))
+# Upper bound on the posting text pasted into the prompt
+MAX_PROMPT_CHARS = int(os.getenv('JOB_PROMPT_MAX_CHARS', '12000'))
+
+USER_AGENT = 'Mozilla/5.0 (compatible; resume-optimizer/1.0)'
+
+# Elements that never hold posting content
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe',
+                'head', 'nav', 'footer', 'aside', 'form', 'button', 'select'}
+# The page-level header is site chrome, but a header inside <main>/<article>
+# usually holds the job title and company, so it's kept there
+HEADER_TAG = 'header'
+# Elements that end a line of text
+BLOCK_TAGS = {'p', 'div', 'section', 'article', 'main', 'br', 'li', 'ul', 'ol', 'tr', 'td', 'th',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'dd', 'dt', 'table', 'blockquote', 'pre', 'hr'}
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'meta', 'link', 'area', 'base', 'col', 'embed', 'source', 'wbr'}
+# Containers that usually wrap the posting itself
+MAIN_TAGS = {'main', 'article'}
+
+# Cookie banners and the like that survive tag filtering
+BOILERPLATE_PATTERN = re.compile(
+    r'\b(cookies?|privacy policy|terms of (use|service)|all rights reserved|sign in|log in|'
+    r'subscribe|share (this|on)|follow us|skip to (main )?content)\b', re.IGNORECASE)
+
+
+class JobFetchError(Exception):
+    pass
+
+
+def create_session(pool_size=None):
+    # Keep-alive connections are reused across postings on the same host;
+    # connection failures and gateway errors get a couple of quick retries
+    pool_size = pool_size or int(os.getenv('JOB_FETCH_POOL_SIZE', '8'))
+    retry = Retry(total=2, connect=2, read=False, backoff_factor=0.3,
+                  status_forcelist=(502, 503, 504), allowed_methods=('GET',))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'text/html,application/xhtml+xml'})
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+session = create_session()
+
+
+def _iter_body(response, chunk_size):
+    # iter_content waits until a whole chunk has arrived, so a host sending a
+    # few bytes at a time is never checked against the deadline; read1 returns
+    # whatever one socket read got (urllib3 2+)
+    raw = response.raw
+    if not hasattr(raw, 'read1'):
+        yield from response.iter_content(chunk_size=chunk_size)
+        return
+    while True:
+        chunk = raw.read1(chunk_size, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+
+def fetch_page(link, etag=None, last_modified=None, max_bytes=None, http=None, download_timeout=None):
+    # Streams the body and stops at max_bytes, so a huge page costs at most
+    # the budget in memory and transfer, and gives up once download_timeout
+    # seconds have passed. With etag/last_modified the request is conditional
+    # and an unchanged page comes back as a bodiless 304.
+    max_bytes = max_bytes or MAX_FETCH_BYTES
+    download_timeout = download_timeout or DOWNLOAD_TIMEOUT
+    deadline = time.monotonic() + download_timeout
+    http = http or session
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    with http.get(link, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=True) as response:
+        page = {
+            'status': response.status_code,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'html': ''
+        }
+        if response.status_code == 304:
+            return page
+        response.raise_for_status()
+        body = b''
+        for chunk in _iter_body(response, 65536):
+            if time.monotonic() > deadline:
+                raise JobFetchError(f'Downloading {link} took longer than {download_timeout:g}s')
+            body += chunk
+            if len(body) >= max_bytes:
+                body = body[:max_bytes]
+                break
+        encoding = response.encoding or 'utf-8'
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            encoding = 'utf-8'
+    page['html'] = body.decode(encoding, errors='replace')
+    return page
+
+def fetch_html(link, max_bytes=None, http=None):
+    return fetch_page(link, max_bytes=max_bytes, http=http)['html']
+
+
+class _TextExtractor(HTMLParser):
+    # Collects visible text, tracking which of it sits inside <main>/<article>
+    # and keeping any JSON-LD blocks, which job boards use for JobPosting data
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self.main_lines = []
+        self.json_ld = []
+        self._current = []
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._headers = []  # whether each open <header> is skipped
+        self._in_json_ld = False
+        self._json_buffer = []
+
+    def _flush(self):
+        text = re.sub(r'\s+', ' ', ''.join(self._current)).strip()
+        self._current = []
+        if text:
+            self.lines.append(text)
+            if self._main_depth:
+                self.main_lines.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'script' and dict(attrs).get('type', '').lower() == 'application/ld+json':
+            self._in_json_ld = True
+            self._json_buffer = []
+        if tag == HEADER_TAG:
+            skipped = not self._main_depth
+            self._headers.append(skipped)
+            if skipped:
+                self._skip_depth += 1
+            else:
+                self._flush()
+        elif tag in SKIPPED_TAGS and tag not in VOID_TAGS:
+            self._skip_depth += 1
+        elif tag in MAIN_TAGS:
+            self._flush()
+            self._main_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag == 'script' and self._in_json_ld:
+            self.json_ld.append(''.join(self._json_buffer))
+            self._in_json_ld = False
+        if tag == HEADER_TAG:
+            if not self._headers or self._headers.pop():
+                self._skip_depth = max(0, self._skip_depth - 1)
+            else:
+                self._flush()
+        elif tag in SKIPPED_TAGS and tag not in VOID_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in MAIN_TAGS:
+            self._flush()
+            self._main_depth = max(0, self._main_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._in_json_ld:
+            self._json_buffer.append(data)
+        elif not self._skip_depth:
+            self._current.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _json_ld_postings(blocks):
+    postings = []
+    for block in blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                types = item.get('@type')
+                if types == 'JobPosting' or (isinstance(types, list) and 'JobPosting' in types):
+                    postings.append(item)
+                stack.extend(item.get('@graph', []))
+    return postings
+
+def _json_ld_text(posting):
+    lines = []
+    organization = posting.get('hiringOrganization')
+    if isinstance(organization, dict):
+        organization = organization.get('name')
+    location = posting.get('jobLocation')
+    if isinstance(location, list):
+        location = location[0] if location else None
+    if isinstance(location, dict):
+        address = location.get('address') or {}
+        if isinstance(address, dict):
+            location = ', '.join(str(address[key]) for key in ('addressLocality', 'addressRegion', 'addressCountry')
+                                 if address.get(key))
+    for label, value in (('Job Title', posting.get('title')), ('Company', organization),
+                         ('Location', location), ('Employment Type', posting.get('employmentType'))):
+        if isinstance(value, list):
+            value = ', '.join(str(v) for v in value)
+        if value:
+            lines.append(f'{label}: {value}')
+    for key in ('description', 'qualifications', 'responsibilities', 'skills', 'educationRequirements',
+                'experienceRequirements'):
+        value = posting.get(key)
+        if isinstance(value, str) and value.strip():
+            # Descriptions in JSON-LD are usually HTML themselves
+            lines.extend(_visible_lines(value))
+    return lines
+
+def _visible_lines(html):
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.lines
+
+def html_to_text(html, max_chars=None):
+    # Reduce a job page to the posting text: structured JobPosting data when
+    # the page has it, otherwise the <main>/<article> text (or the whole body),
+    # minus boilerplate lines and repeats, capped at max_chars
+    max_chars = max_chars or MAX_PROMPT_CHARS
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+
+    postings = _json_ld_postings(extractor.json_ld)
+    if postings:
+        lines = _json_ld_text(postings[0])
+    elif extractor.main_lines:
+        lines = extractor.main_lines
+    else:
+        lines = extractor.lines
+
+    kept = []
+    seen = set()
+    for line in lines:
+        key = line.lower()
+        if key in seen or (len(line) < 120 and BOILERPLATE_PATTERN.search(line)):
+            continue
+        seen.add(key)
+        kept.append(line)
+
+    text = '\n'.join(kept)
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit('\n', 1)[0]
+    return text
+
+def fetch_job_posting(link, etag=None, last_modified=None):
+    # fetch_page plus the reduced posting text, in the shape JobPostingCache
+    # expects from its fetch callable
+    page = fetch_page(link, etag, last_modified)
+    if page['status'] == 304:
+        page['text'] = ''
+        return page
+    page['text'] = html_to_text(page.pop('html'))
+    if not page['text']:
+        raise JobFetchError(f'No readable text found at {link}')
+    return page
@@ -0,0 +1,77 @@
+import json
+import os
+from werkzeug.utils import secure_filename
+
+# Structured job postings as extracted by Gemini (a dict keyed by the prompt's
+# field names). Each scraped posting is saved twice in the workspace: the
+# structured .json, which the scoring step reads, and the formatted .txt
+# shown to people.
+
+def format_posting(posting):
+    return f"""
+Job Title: {posting.get('Job Title', 'N/A')}
+Company: {posting.get('Company Name', 'N/A')}
+
+Description:
+{posting.get('Job Description', 'N/A')}
+
+Education Requirements:
+{posting.get('Required Education', 'Not specified')}
+
+Skills:
+{', '.join(posting.get('Required Skills', []))}
+
+Key Responsibilities:
+{', '.join(posting.get('Key Responsibilities', []))}
+
+Experience Level: {posting.get('Experience Level', 'N/A')}
+Location: {posting.get('Location', 'N/A')}
+Employment Type: {posting.get('Employment Type', 'N/A')}
+
+Keywords:
+{', '.join(posting.get('Top 20 Keywords', []))}
+"""
+
+def save_job_posting(posting, directory):
+    # Returns the path of the formatted .txt; the .json sits next to it
+    stem = os.path.splitext(secure_filename(f"{posting['Company Name']}_{posting['Job Title']}.txt"))[0]
+    json_path = os.path.join(directory, f"{stem}.json")
+    text_path = os.path.join(directory, f"{stem}.txt")
+    with open(json_path, 'w') as f:
+        json.dump(posting, f, indent=2)
+    with open(text_path, 'w') as f:
+        f.write(format_posting(posting))
+    return text_path
+
+def load_job_posting(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def latest_job_posting_path(directory):
+    # Newest posting in the directory by modification time, or None if it's
+    # empty. Scraped postings are saved with their structured .json, which
+    # is returned instead of the formatted .txt copy.
+    if not os.path.isdir(directory):
+        return None
+    names = sorted(os.listdir(directory), key=lambda name: os.path.getmtime(os.path.join(directory, name)))
+    if not names:
+        return None
+    json_path = os.path.join(directory, f"{os.path.splitext(names[-1])[0]}.json")
+    if os.path.exists(json_path):
+        return json_path
+    return os.path.join(directory, names[-1])
+
+def load_job_descriptions(directory):
+    # Every posting in a directory as (name, text) pairs. Scraped postings
+    # come as a .json and its formatted .txt; the .json is used.
+    names = sorted(os.listdir(directory))
+    postings = []
+    for filename in names:
+        base, extension = os.path.splitext(filename)
+        path = os.path.join(directory, filename)
+        if extension == '.json':
+            postings.append((base, format_posting(load_job_posting(path))))
+        elif extension == '.txt' and f'{base}.json' not in names:
+            with open(path, 'r') as f:
+                postings.append((base, f.read()))
+    return postings
@@ -0,0 +1,176 @@
+import argparse
+import os
+import threading
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from job_postings import load_job_descriptions
+
+# The term space every score is computed in. Terms are hashed into a fixed
+# number of features, so no term is dropped for being outside a vocabulary
+# and vectors from different requests, workers and runs are comparable. The
+# IDF weights are fitted once on a corpus of job postings (sklearn's smooth
+# IDF: ln((1 + n) / (1 + df)) + 1) and saved; a term the corpus never saw
+# gets the highest weight. Each worker loads the saved weights once, so
+# scoring a request only transforms text.
+#
+# IDF from a handful of postings is noise, so the corpus needs at least
+# JOB_CORPUS_MIN_SIZE distinct postings. job_postings/ in this repo only
+# holds sample postings; fit a real corpus with
+#   python job_vectorizer.py --corpus <directory of postings>
+# (.txt or .json, searched recursively). Until one is saved, scoring uses
+# unit IDF (plain term-frequency cosine) and nothing is written to disk.
+#
+# Scraped postings keep landing in JOB_CORPUS_DIR, so a saved fit is redone
+# when a process starts and the corpus has grown JOB_CORPUS_REFIT_FACTOR
+# times past the postings it was fitted on. Weights never change inside a
+# running process, so its scores stay comparable; the candidate index
+# applies IDF at load time, so a refit doesn't invalidate it.
+
+N_FEATURES = 2 ** 18
+JOB_VECTORIZER_PATH = os.getenv('JOB_VECTORIZER_PATH', os.path.join('cache', 'job_vectorizer.npz'))
+JOB_CORPUS_DIR = os.getenv('JOB_CORPUS_DIR', 'job_postings')
+JOB_CORPUS_MIN_SIZE = int(os.getenv('JOB_CORPUS_MIN_SIZE', '50'))
+JOB_CORPUS_REFIT_FACTOR = float(os.getenv('JOB_CORPUS_REFIT_FACTOR', '2'))
+
+
+class JobVectorizer:
+    def __init__(self, idf, corpus_size=0, corpus_files=None):
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.n_features = len(self.idf)
+        self.corpus_size = corpus_size
+        # Posting files in the corpus directory when it was fitted
+        self.corpus_files = corpus_size if corpus_files is None else corpus_files
+        self._hasher = HashingVectorizer(n_features=self.n_features, alternate_sign=False, norm=None)
+
+    @classmethod
+    def unit(cls, n_features=N_FEATURES):
+        # No corpus: every term weighs the same
+        return cls(np.ones(n_features), corpus_size=0)
+
+    @classmethod
+    def fit(cls, documents, n_features=N_FEATURES):
+        hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        document_frequency = np.zeros(n_features)
+        if documents:
+            counts = hasher.transform(documents).tocsc()
+            document_frequency = np.diff(counts.indptr).astype(np.float64)
+        idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+        return cls(idf, corpus_size=len(documents))
+
+    def counts(self, texts):
+        # Raw term counts, (texts x features)
+        return self._hasher.transform(texts)
+
+    def weight(self, counts):
+        # TF-IDF rows with unit length, so a dot product is the cosine
+        weighted = counts.tocsr(copy=True).astype(np.float64)
+        weighted.data *= self.idf[weighted.indices]
+        return normalize(weighted, copy=False)
+
+    def transform(self, texts):
+        return self.weight(self.counts(texts))
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez_compressed(temporary_path, idf=self.idf, corpus_size=self.corpus_size,
+                            corpus_files=self.corpus_files)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            corpus_files = int(data['corpus_files']) if 'corpus_files' in data.files else None
+            return cls(data['idf'], corpus_size=int(data['corpus_size']), corpus_files=corpus_files)
+
+
+def load_corpus(directory):
+    # Every distinct posting under directory, one text each; a posting saved
+    # more than once would otherwise count as several documents
+    documents = []
+    seen = set()
+    if os.path.isdir(directory):
+        for root, _, _ in sorted(os.walk(directory)):
+            for _, text in load_job_descriptions(root):
+                if text not in seen:
+                    seen.add(text)
+                    documents.append(text)
+    return documents
+
+def count_corpus_files(directory):
+    # Posting files load_corpus() would read, without reading them
+    count = 0
+    if os.path.isdir(directory):
+        for _, _, filenames in os.walk(directory):
+            names = set(filenames)
+            count += sum(1 for name in names if name.endswith('.json')
+                         or (name.endswith('.txt') and f'{name[:-4]}.json' not in names))
+    return count
+
+def build_job_vectorizer(corpus_dir=JOB_CORPUS_DIR, path=JOB_VECTORIZER_PATH, min_size=JOB_CORPUS_MIN_SIZE):
+    # Fits and saves the vectorizer; None if the corpus is too small to fit on
+    corpus_files = count_corpus_files(corpus_dir)
+    documents = load_corpus(corpus_dir)
+    if len(documents) < min_size:
+        return None
+    vectorizer = JobVectorizer.fit(documents)
+    vectorizer.corpus_files = corpus_files
+    vectorizer.save(path)
+    return vectorizer
+
+_vectorizer = None
+_vectorizer_lock = threading.Lock()
+
+def get_job_vectorizer():
+    # The worker's shared vectorizer: loaded from JOB_VECTORIZER_PATH, or
+    # fitted on JOB_CORPUS_DIR and saved there the first time or once the
+    # corpus has grown enough. Falls back to unit IDF, without saving it,
+    # when the corpus is too small.
+    global _vectorizer
+    with _vectorizer_lock:
+        if _vectorizer is None:
+            saved = None
+            if os.path.exists(JOB_VECTORIZER_PATH):
+                saved = JobVectorizer.load(JOB_VECTORIZER_PATH)
+                if saved.corpus_size < JOB_CORPUS_MIN_SIZE:
+                    print(f"Warning: {JOB_VECTORIZER_PATH} was fitted on {saved.corpus_size} job postings, "
+                          f"fewer than {JOB_CORPUS_MIN_SIZE}; ignoring it")
+                    saved = None
+            if saved is None or count_corpus_files(JOB_CORPUS_DIR) >= saved.corpus_files * JOB_CORPUS_REFIT_FACTOR:
+                fitted = build_job_vectorizer()
+                if fitted is not None and saved is not None:
+                    print(f"Refitted {JOB_VECTORIZER_PATH} on {fitted.corpus_size} job postings "
+                          f"(was {saved.corpus_size})")
+                saved = fitted or saved
+            if saved is None:
+                print(f"Warning: {JOB_CORPUS_DIR} has fewer than {JOB_CORPUS_MIN_SIZE} distinct job postings; "
+                      f"using unit IDF. Fit a real corpus with: python job_vectorizer.py --corpus <directory>")
+                saved = JobVectorizer.unit()
+            _vectorizer = saved
+        return _vectorizer
+
+def use_job_vectorizer(vectorizer):
+    # Installs an already loaded vectorizer, e.g. in a worker process
+    global _vectorizer
+    with _vectorizer_lock:
+        _vectorizer = vectorizer
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fit the IDF weights of the shared job vectorizer on a corpus of job postings.')
+    parser.add_argument('--corpus', default=JOB_CORPUS_DIR, help='Directory of job postings (.txt or .json), searched recursively')
+    parser.add_argument('--output', default=JOB_VECTORIZER_PATH, help='Path of the vectorizer file to write')
+    args = parser.parse_args(argv)
+
+    vectorizer = build_job_vectorizer(args.corpus, args.output)
+    if vectorizer is None:
+        parser.error(f"{args.corpus} has {len(load_corpus(args.corpus))} distinct job postings; at least "
+                     f"{JOB_CORPUS_MIN_SIZE} are needed (JOB_CORPUS_MIN_SIZE)")
+    print(f"Fitted on {vectorizer.corpus_size} job postings. Vectorizer written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    # Status record for one pipeline run. Every update bumps version and wakes
+    # anyone waiting in wait_for_update(), which is what the event stream uses.
+    def __init__(self, stages):
+        self.id = uuid.uuid4().hex
+        self.stages = stages
+        self.status = 'queued'
+        self.stage = None
+        self.error = None
+        self.result = None
+        self.created = time.time()
+        self.updated = self.created
+        self.version = 0
+        self._changed = threading.Condition()
+
+    def update(self, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.updated = time.time()
+            self.version += 1
+            self._changed.notify_all()
+
+    def wait_for_update(self, version, timeout=None):
+        # Block until the job changes past version; returns the new version
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout=timeout)
+            return self.version
+
+    @property
+    def finished(self):
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'stage': self.stage,
+            'stages': self.stages,
+            'error': self.error,
+            'result': self.result,
+            'created': self.created,
+            'updated': self.updated
+        }
+
+
+class JobQueue:
+    # Runs pipeline jobs on a bounded pool of worker threads. A job is a list of
+    # (stage name, function) pairs; each function receives the shared payload
+    # dict, and the last stage's return value becomes the job result. Jobs
+    # only exist in this process, so the server runs as a single gunicorn
+    # worker with threads (gunicorn.conf.py).
+    def __init__(self, max_workers=4, max_pending=32, retention_seconds=3600):
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pipeline')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, stages, payload):
+        job = Job([name for name, _ in stages])
+        with self._lock:
+            self._prune()
+            pending = sum(1 for existing in self._jobs.values() if not existing.finished)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f'Too many pipeline jobs in progress ({pending})')
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, stages, payload)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [job.id for job in self._jobs.values() if job.finished and job.updated < cutoff]:
+            del self._jobs[job_id]
+
+    def _run(self, job, stages, payload):
+        result = None
+        for name, stage in stages:
+            job.update(status='running', stage=name)
+            try:
+                result = stage(payload)
+            except Exception as e:
+                job.update(status='failed', error=f'{name} failed: {e}')
+                return
+        job.update(status='succeeded', stage=None, result=result)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,98 @@
+import hashlib
+import os
+import shutil
+import threading
+import yaml
+
+
+class ParseCache:
+    # Content-addressed cache of parsed resumes. Entries are keyed by the
+    # SHA-256 of the PDF bytes together with a parser version (prompt, model and
+    # render settings), stored as YAML files, and evicted least recently used
+    # first once the directory grows past max_bytes.
+    def __init__(self, directory, version, max_bytes=64 * 1024 * 1024, purge_on_version_change=True):
+        self.directory = directory
+        self.version = version
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        if purge_on_version_change and self._stored_version() != version:
+            self.invalidate()
+
+    def _version_path(self):
+        return os.path.join(self.directory, 'VERSION')
+
+    def _stored_version(self):
+        if not os.path.exists(self._version_path()):
+            return None
+        with open(self._version_path(), 'r') as f:
+            return f.read().strip()
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.yaml')
+
+    def key_for(self, pdf_bytes):
+        digest = hashlib.sha256(self.version.encode('utf-8'))
+        digest.update(pdf_bytes)
+        return digest.hexdigest()
+
+    def key_for_file(self, file_path):
+        with open(file_path, 'rb') as f:
+            return self.key_for(f.read())
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                data = yaml.safe_load(f)
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w') as f:
+            yaml.safe_dump(data, f, default_flow_style=False)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith('.yaml'):
+                        stat = os.stat(os.path.join(root, name))
+                        entries.append((stat.st_mtime, stat.st_size, os.path.join(root, name)))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def invalidate(self):
+        # Drop every cached parse, e.g. after the parsing prompt changed
+        with self._lock:
+            for entry in os.listdir(self.directory):
+                entry_path = os.path.join(self.directory, entry)
+                if os.path.isdir(entry_path):
+                    shutil.rmtree(entry_path, ignore_errors=True)
+            with open(self._version_path(), 'w') as f:
+                f.write(self.version)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
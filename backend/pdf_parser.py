@@ -1,60 +1,41 @@
 import os
+import io
+import re
+import hashlib
 from pdf2image import convert_from_path
-import google.generativeai as genai
 import yaml
-import shutil
-import time
-from dotenv import load_dotenv
-load_dotenv()
-apiKey = os.getenv('API_KEY_NAME')
-
-# Configure the Gemini API
-genai.configure(api_key=apiKey)
-
-def clear_directory(directory):
-    # Check if the directory exists
-    if os.path.exists(directory):
-        # Iterate over all files and sub-directories in the directory
-        for entry in os.listdir(directory):
-            entry_path = os.path.join(directory, entry)
-            try:
-                if os.path.isfile(entry_path):
-                    os.unlink(entry_path)  # Remove file
-                elif os.path.isdir(entry_path):
-                    shutil.rmtree(entry_path)  # Remove directory recursively
-            except Exception as e:
-                print(f"Failed to delete {entry_path}. Reason: {e}")
-    else:
-        print(f"Directory '{directory}' does not exist.")
-
-
-def parse_pdf(file_path):
-    try:
-        # Convert PDF to images
-        images = convert_from_path(file_path)
-        
-        # Create 'gemini' folder if it doesn't exist
-        output_folder = 'gemini'
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
-
-        # Extract base file name without extension
-        base_file_name = os.path.splitext(os.path.basename(file_path))[0]
-
-        # Process and save each image
-        for i, image in enumerate(images):
-            image_file = os.path.join(output_folder, f'{base_file_name}_page_{i+1}.png')
-            image.save(image_file, 'PNG')
-            print(f'Saved {image_file}')
-        
-        # We'll use the first page of the resume for this example
-        first_image_path = os.path.join(output_folder, f'{base_file_name}_page_1.png')
-        
-        # Initialize the Gemini model
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Prepare the prompt
-        prompt = """
+from gemini_client import gemini, GEMINI_MODEL_NAME
+from parse_cache import ParseCache
+from text_layer import parse_pdf_text_layer, TEXT_LAYER_VERSION
+from resume_schema import validate_resume, ResumeValidationError, SCHEMA_VERSION
+
+# Rasterization settings for the page images sent to Gemini. Only the first
+# page is needed for a one-page resume, and 150 DPI grayscale is plenty for
+# the model to read the text.
+RENDER_PAGES = int(os.getenv('RESUME_RENDER_PAGES', '1'))
+RENDER_DPI = int(os.getenv('RESUME_RENDER_DPI', '150'))
+RENDER_GRAYSCALE = os.getenv('RESUME_RENDER_GRAYSCALE', '1') == '1'
+
+def render_pages(file_path, pages=None, dpi=None, grayscale=None):
+    # Rasterize the first `pages` pages and return them as in-memory PNG bytes
+    pages = pages or RENDER_PAGES
+    dpi = dpi or RENDER_DPI
+    grayscale = RENDER_GRAYSCALE if grayscale is None else grayscale
+    images = convert_from_path(file_path, dpi=dpi, first_page=1, last_page=pages, grayscale=grayscale)
+
+    encoded_pages = []
+    for image in images:
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        encoded_pages.append(buffer.getvalue())
+    return encoded_pages
+
+
+# Try the PDF's own text layer before rasterizing and calling Gemini
+TEXT_LAYER_ENABLED = os.getenv('RESUME_TEXT_LAYER', '1') == '1'
+
+# Prompt sent with the resume page images
+RESUME_PROMPT = """
         Parse this resume image and return the information in the following YAML format:
         It should be in the same order and with no extraneous dashes or tabs/indents. It needs to match this structure and order exactly. 
         Also, make sure the gpa is just the gpa value. Do not include the denominator. 
@@ -112,33 +93,91 @@ def parse_pdf(file_path):
         A slash in a heading indicates 1 key. For example x/y: .... - in this case the actual value starts from after the colon. Anything with a colon in it should strictly be ignored as a value passed to any of the YAML keys. 
         Ensure all information is accurately extracted from the image and formatted according to this YAML structure. 
         """
-        
-        # Upload the image and get its identifier
-        image = genai.upload_file(path=first_image_path, display_name="resume")
-        
-        # Generate content
-        response = model.generate_content([image, prompt])
-
-        yaml_content = response.candidates[0].content.parts[0].text
-        # Remove the first and last lines of the response text
-        yaml_lines = yaml_content.split('\n')
-        if len(yaml_lines) > 2:
-            yaml_lines = yaml_lines[1:-1]
-        yaml_content = "\n".join(yaml_lines)
-
-        # print(yaml_content)
-        
-        yaml_file_path = 'test.yaml'
-        with open(yaml_file_path, 'w') as file:
-            file.write(yaml_content)
-
-        # Parse the YAML content
-        parsed_data = yaml.safe_load(yaml_content)
-        clear_directory('gemini')
-        return parsed_data
+
+# Follow-up sent when a reply doesn't validate. The retry reuses the image
+# parts from gemini.image_part(): pages over GEMINI_INLINE_IMAGE_BYTES were
+# uploaded once and are only referenced again, but small pages are inline
+# data and are sent again with every attempt.
+RETRY_PROMPT = """
+        Your previous answer did not match the required YAML structure. Problems found:
+        {errors}
+
+        Previous answer:
+        {previous}
+
+        Return the corrected YAML only, in the same structure and order, following all of the rules above.
+        """
+
+# Number of corrective retries after a reply fails validation
+RESUME_PARSE_RETRIES = int(os.getenv('RESUME_PARSE_RETRIES', '1'))
+
+YAML_BLOCK_PATTERN = re.compile(r'```(?:ya?ml)?[ \t]*\n(.*?)```', re.DOTALL | re.IGNORECASE)
+
+# Identifies everything that affects a parse, so cached results from an older
+# prompt, model or render setting are never reused
+PARSER_VERSION = hashlib.sha256(
+    f"{RESUME_PROMPT}|{GEMINI_MODEL_NAME}|{RENDER_PAGES}|{RENDER_DPI}|{RENDER_GRAYSCALE}|"
+    f"{TEXT_LAYER_ENABLED}|{TEXT_LAYER_VERSION}|{SCHEMA_VERSION}".encode('utf-8')
+).hexdigest()[:16]
+
+parse_cache = ParseCache(
+    os.getenv('PARSE_CACHE_DIR', os.path.join('cache', 'parsed_resumes')),
+    PARSER_VERSION,
+    max_bytes=int(os.getenv('PARSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+)
+
+def parse_pdf(file_path):
+    # Re-uploads of a PDF we've already parsed skip rasterization and Gemini
+    cache_key = parse_cache.key_for_file(file_path)
+    cached = parse_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Only scanned PDFs, unusual layouts or parses that fail validation go
+    # through the image + LLM path
+    parsed_data = parse_pdf_text_layer(file_path) if TEXT_LAYER_ENABLED else None
+    if parsed_data is None:
+        parsed_data = parse_pdf_with_gemini(file_path)
+    if parsed_data:
+        parse_cache.put(cache_key, parsed_data)
+    return parsed_data
+
+def extract_yaml(reply_text):
+    # Gemini usually wraps its answer in a ```yaml fence, but not always
+    match = YAML_BLOCK_PATTERN.search(reply_text)
+    return match.group(1) if match else reply_text
+
+def parse_reply(reply_text):
+    # Raises ResumeValidationError when the reply isn't a valid resume
+    try:
+        data = yaml.safe_load(extract_yaml(reply_text))
+    except yaml.YAMLError as e:
+        raise ResumeValidationError([f'reply is not valid YAML: {e}'])
+    return validate_resume(data)
+
+def parse_pdf_with_gemini(file_path):
+    try:
+        # Convert only the pages we send to images, without touching the disk
+        page_images = render_pages(file_path)
+
+        # Small pages go inline with the request, larger ones are uploaded
+        images = [gemini.image_part(page, 'image/png', display_name=f"resume_page_{i+1}")
+                  for i, page in enumerate(page_images)]
+
+        prompt = [RESUME_PROMPT]
+        for attempt in range(RESUME_PARSE_RETRIES + 1):
+            # The shared client handles the quota, timeouts and transient retries
+            reply_text = gemini.generate_text(images + prompt)
+
+            try:
+                return parse_reply(reply_text)
+            except ResumeValidationError as e:
+                print(f"Gemini reply for {file_path} failed validation (attempt {attempt + 1}): {e}")
+                errors = '\n'.join(f'- {error}' for error in e.errors)
+                prompt = [RESUME_PROMPT, RETRY_PROMPT.format(errors=errors, previous=reply_text)]
+        return None
     except Exception as e:
         print(f"Error parsing PDF: {str(e)}")
-        clear_directory('gemini')
         return None
 
 def save_as_yaml(data, output_path):
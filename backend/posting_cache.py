@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class JobPostingCache:
+    # Structured job postings cached in sqlite. pages remembers, per URL, the
+    # validators from the last fetch (ETag/Last-Modified), when it was last
+    # checked and the hash of the reduced posting text; postings holds one
+    # extraction per content hash, so the same posting reached through
+    # different URLs (tracking parameters, mirrors) is only extracted once.
+    # fetch(url, etag, last_modified) returns a dict with status (200 or 304),
+    # text, etag and last_modified; extract(text) returns the structured
+    # posting and is only called for text we haven't seen before.
+    def __init__(self, fetch, extract, db_path, fresh_seconds=3600, clock=time.time):
+        self.fetch = fetch
+        self.extract = extract
+        self.db_path = db_path
+        self.fresh_seconds = fresh_seconds
+        self.clock = clock
+        self.hits = 0
+        self.revalidated = 0
+        self.content_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, etag TEXT, '
+                                     'last_modified TEXT, content_hash TEXT NOT NULL, checked_at REAL NOT NULL)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS postings (content_hash TEXT PRIMARY KEY, '
+                                     'posting TEXT NOT NULL, created_at REAL NOT NULL)')
+            self._connection.commit()
+        return self._connection
+
+    def lookup(self, url):
+        # The cached page for url with its posting, or None
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT pages.etag, pages.last_modified, pages.content_hash, pages.checked_at, postings.posting '
+                'FROM pages JOIN postings ON pages.content_hash = postings.content_hash WHERE pages.url = ?',
+                (url,)).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, content_hash, checked_at, posting = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': content_hash,
+            'checked_at': checked_at,
+            'fresh': self.clock() - checked_at < self.fresh_seconds,
+            'posting': json.loads(posting)
+        }
+
+    def posting_for_hash(self, content_hash):
+        with self._lock:
+            row = self._connect().execute('SELECT posting FROM postings WHERE content_hash = ?',
+                                          (content_hash,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def touch(self, url):
+        # A 304 from the origin: the cached posting is good for another period
+        with self._lock:
+            connection = self._connect()
+            connection.execute('UPDATE pages SET checked_at = ? WHERE url = ?', (self.clock(), url))
+            connection.commit()
+
+    def store(self, url, content_hash, posting, etag=None, last_modified=None):
+        now = self.clock()
+        with self._lock:
+            connection = self._connect()
+            connection.execute('INSERT OR IGNORE INTO postings (content_hash, posting, created_at) VALUES (?, ?, ?)',
+                               (content_hash, json.dumps(posting), now))
+            connection.execute('INSERT OR REPLACE INTO pages (url, etag, last_modified, content_hash, checked_at) '
+                               'VALUES (?, ?, ?, ?, ?)', (url, etag, last_modified, content_hash, now))
+            connection.commit()
+
+    def get(self, url):
+        cached = self.lookup(url)
+        if cached is not None and cached['fresh']:
+            self.hits += 1
+            return cached['posting']
+
+        # Stale or unknown: ask the origin, conditionally when we can
+        page = self.fetch(url, cached and cached['etag'], cached and cached['last_modified'])
+        if page['status'] == 304 and cached is not None:
+            self.touch(url)
+            self.revalidated += 1
+            return cached['posting']
+
+        # Hash the reduced text rather than the raw HTML, which changes on
+        # every request on most job boards (CSRF tokens, ads, timestamps)
+        content_hash = hashlib.sha256(page['text'].encode('utf-8')).hexdigest()
+        posting = self.posting_for_hash(content_hash)
+        if posting is not None:
+            self.content_hits += 1
+        else:
+            self.misses += 1
+            posting = self.extract(page['text'])
+        self.store(url, content_hash, posting, page.get('etag'), page.get('last_modified'))
+        return posting
+
+    def stats(self):
+        with self._lock:
+            pages = self._connect().execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+            postings = self._connect().execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'content_hits': self.content_hits,
+                'misses': self.misses,
+                'pages': pages,
+                'postings': postings
+            }
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute('DELETE FROM pages')
+            connection.execute('DELETE FROM postings')
+            connection.commit()
@@ -0,0 +1,48 @@
+import os
+import threading
+import time
+
+
+class TokenBucket:
+    # Thread-safe token bucket shared by every caller of a rate-limited API.
+    # Each acquire() reserves the next free slot under the lock and then sleeps
+    # outside it, so callers only wait when the quota is actually exhausted and
+    # are served in arrival order.
+    def __init__(self, requests_per_minute, burst=None, clock=time.monotonic, sleep=time.sleep):
+        if requests_per_minute <= 0:
+            raise ValueError('requests_per_minute must be positive')
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1, int(requests_per_minute))
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.waited = 0.0
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        # Returns True once the caller may proceed, or False if that would take
+        # longer than timeout seconds (in which case nothing is consumed)
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            if timeout is not None and wait > timeout:
+                self.tokens += 1
+                return False
+            self.waited += wait
+        if wait > 0:
+            self.sleep(wait)
+        return True
+
+
+# Shared limiter for Gemini API calls, configured in requests per minute
+gemini_limiter = TokenBucket(
+    float(os.getenv('GEMINI_REQUESTS_PER_MINUTE', '15')),
+    burst=int(os.getenv('GEMINI_BURST', '0')) or None
+)
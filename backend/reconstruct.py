@@ -1,13 +1,79 @@
+import ast
+import copy
 import yaml
 import os
+import re
+import argparse
 from datetime import datetime
+from workspace import Workspace
+from scoring_handoff import load_handoff
 
-# Load data from the text file
-with open('resume_analysis.txt', 'r') as file:
-    content = file.read()
+# Builds the optimized resume from the scoring results. The scoring step's
+# handoff (scoring_handoff.py) carries the selected entries themselves and
+# goes through reconstruct_from_handoff(). reconstruct_resume() takes item
+# names instead, as read back from resume_analysis.txt, and looks them up in
+# the parsed resumes.
 
-# Split the content into sections
-sections = content.split('\n\n')
+# Selection keys, in the order resume_analysis.txt lists them
+SELECTION_SECTIONS = ['experiences', 'projects', 'involvements', 'courseworks', 'research',
+                      'additional_skills', 'developer_tools', 'languages', 'technologies']
+HEADER_PATTERN = re.compile(r'^Top (?:\d+ )?(.+?):$')
+
+
+class ResumeIndex:
+    # The parsed resumes, loaded once and indexed by experience company,
+    # project title and research description, so each item lookup is a
+    # dict access instead of a re-read of every YAML file. The first entry
+    # seen for a key wins, as with the file scan this replaces.
+    def __init__(self, resumes):
+        # resumes is a list of (name, parsed resume dict) pairs
+        self.basic_info = None
+        self.education = None
+        self.experience = {}
+        self.projects = {}
+        self.research = {}
+        self.research_entries = []
+        for name, resume_data in resumes:
+            if not resume_data:
+                continue
+            if self.basic_info is None and 'information' in resume_data and 'education' in resume_data:
+                self.basic_info, self.education = resume_data['information'], resume_data['education']
+            for entry in resume_data.get('experience') or []:
+                self.experience.setdefault(entry['company'], entry)
+            for entry in resume_data.get('projects') or []:
+                self.projects.setdefault(entry['title'], entry)
+            for entry in resume_data.get('research') or []:
+                self.research.setdefault(str(entry['description']), entry)
+                self.research_entries.append(entry)
+
+    @classmethod
+    def from_directory(cls, directory):
+        return cls(load_parsed_resumes(directory))
+
+    def find(self, item_type, item_name):
+        # Returns a copy, so callers can edit it and repeated items don't share one dict
+        if item_type == 'experience':
+            entry = self.experience.get(item_name.split(':')[0].strip())
+        elif item_type == 'projects':
+            entry = self.projects.get(item_name)
+        else:
+            entry = self.research.get(item_name)
+            if entry is None:
+                # The analysis may hold only part of the description
+                entry = next((e for e in self.research_entries if item_name in str(e['description'])), None)
+        return copy.deepcopy(entry)
+
+    def basic_info_and_education(self):
+        return copy.deepcopy(self.basic_info), copy.deepcopy(self.education)
+
+
+def load_parsed_resumes(directory):
+    resumes = []
+    for filename in os.listdir(directory):
+        if filename.endswith('.yaml'):
+            with open(os.path.join(directory, filename), 'r') as file:
+                resumes.append((filename, yaml.safe_load(file)))
+    return resumes
 
 # Function to extract items and scores
 def extract_items_and_scores(section):
@@ -21,50 +87,53 @@ def extract_items_and_scores(section):
             items.append(line.strip('- ').strip())
     return items
 
-# Extract data from each section
-experiences = extract_items_and_scores(sections[1])
-projects = extract_items_and_scores(sections[2])
-involvements = extract_items_and_scores(sections[3])
-courseworks = extract_items_and_scores(sections[4])
-research = extract_items_and_scores(sections[5])
-additional_skills = extract_items_and_scores(sections[6])
-developer_tools = extract_items_and_scores(sections[7])
-languages = extract_items_and_scores(sections[8])
-technologies = extract_items_and_scores(sections[9])
-
-file_timestamp = ''
-with open('run_timestamp_file.txt', 'r') as f:
-    file_timestamp = f.read().strip()
-directory = os.path.join('parsed_resumes', file_timestamp,)
-
-# Function to find matching information in parsed resumes
-def find_matching_info(item_type, item_name):
-    for filename in os.listdir(directory):
-        if filename.endswith('.yaml'):
-            with open(os.path.join(directory, filename), 'r') as file:
-                resume_data = yaml.safe_load(file)
-                if item_type in resume_data:
-                    for entry in resume_data[item_type]:
-                        if item_type == 'experience' and entry['company'] == item_name.split(':')[0].strip():
-                            return entry
-                        elif item_type == 'projects' and entry['title'] == item_name:
-                            return entry
-                        elif item_type == 'research' and item_name in str(entry['description']):
-                            return entry
-    return None
-
-# Function to get basic information and education from parsed resumes
-def get_basic_info_and_education():
-    for filename in os.listdir(directory):
-        if filename.endswith('.yaml'):
-            with open(os.path.join(directory, filename), 'r') as file:
-                resume_data = yaml.safe_load(file)
-                if 'information' in resume_data and 'education' in resume_data:
-                    return resume_data['information'], resume_data['education']
-    return None, None
+def parse_analysis(content):
+    # resume_analysis.txt -> {selection key: [item names]}, matching each
+    # block to its section by its header rather than by position
+    headers = {section.replace('_', ' '): section for section in SELECTION_SECTIONS}
+    selections = {section: [] for section in SELECTION_SECTIONS}
+    for block in content.split('\n\n'):
+        match = HEADER_PATTERN.match(block.split('\n', 1)[0].strip())
+        if not match:
+            continue
+        header = match.group(1).lower()
+        section = headers.get(header) or headers.get(header.rstrip('s')) or headers.get(header + 's')
+        if section:
+            selections[section] = extract_items_and_scores(block)
+    return selections
 
-# Function to parse dates in the format "Month YYYY"
+def selections_from_results(results):
+    # ScoringEngine.score() output -> the item names resume_analysis.txt would list
+    return {
+        'experiences': [f"{exp['company']}: {exp['title']}" for exp, score in results['experiences']],
+        'projects': [proj['title'] for proj, score in results['projects']],
+        'involvements': [inv for inv, score in results['involvements']],
+        'courseworks': [course for course, score in results['courseworks']],
+        'research': [str(res['description']) for res, score in results['research']],
+        'additional_skills': [skill for skill, score in results['additional_skills']],
+        'developer_tools': [tool for tool, score in results['developer_tools']],
+        'languages': [lang for lang, score in results['languages']],
+        'technologies': [tech for tech, score in results['technologies']]
+    }
+
+def parse_description(description):
+    # Research descriptions sometimes come back as the string form of a
+    # list; read it as a literal instead of evaluating it
+    if not isinstance(description, str):
+        return description
+    try:
+        value = ast.literal_eval(description)
+    except (ValueError, SyntaxError):
+        return [description]
+    if isinstance(value, (list, tuple)):
+        return [str(line) for line in value]
+    return [description]
+
+# Function to parse dates in the format "Month YYYY"; None when missing or unparseable
 def parse_date(date_str):
+    if not date_str:
+        return None
+    date_str = str(date_str).strip()
     if date_str.lower() in ['present', 'current', 'now']:
         return datetime.max  # Use a very large date for 'Present'
     try:
@@ -74,103 +143,182 @@ def parse_date(date_str):
 
 # Function to get both start and end dates
 def get_start_end_dates(date_range):
-    dates = date_range.split(' - ')
+    dates = (date_range or '').split(' - ')
     start_date = parse_date(dates[0])
     end_date = parse_date(dates[-1])
     return start_date, end_date
 
+# Undated entries (the schema keeps missing dates as None) sort last
+def date_key(date):
+    return date or datetime.min
+
 # Updated sorting key function
 def sort_key(x):
-    dates = x.get('dates', '').split(' - ')
+    dates = (x.get('dates') or '').split(' - ')
     end_date = parse_date(dates[-1])
     start_date = parse_date(dates[0]) if len(dates) > 1 else None
-    return (end_date, start_date)
-
-# Get basic information and education
-basic_info, education = get_basic_info_and_education()
-
-if not basic_info or not education:
-    print("Error: Could not find basic information or education in parsed resumes.")
-    exit(1)
-
-# Create the new YAML structure
-new_yaml = {
-    'information': basic_info,
-    'education': education,
-    'experience': [],
-    'projects': [],
-    'research': [],
-    'technical-skills': {
-        'languages': ', '.join(languages),
-        'technologies': ', '.join(technologies),
-        'developer-tools': ', '.join(developer_tools),
-        'additional-skills': ', '.join(additional_skills)
+    return (date_key(end_date), date_key(start_date))
+
+def build_resume(basic_info, education, experience, projects, research, selections):
+    # Merges the chosen entries into the new resume structure; selections
+    # supplies the coursework, involvement and skill names
+    if not basic_info or not education:
+        raise ValueError('Could not find basic information or education in parsed resumes.')
+
+    # Create the new YAML structure
+    new_yaml = {
+        'information': basic_info,
+        'education': education,
+        'experience': experience,
+        'projects': projects,
+        'research': research,
+        'technical-skills': {
+            'languages': ', '.join(selections['languages']),
+            'technologies': ', '.join(selections['technologies']),
+            'developer-tools': ', '.join(selections['developer_tools']),
+            'additional-skills': ', '.join(selections['additional_skills'])
+        }
     }
-}
 
-# Update education with coursework and involvement
-new_yaml['education']['relevant-coursework'] = ', '.join(courseworks)
-new_yaml['education']['involvement'] = ', '.join(involvements)
+    # Update education with coursework and involvement
+    new_yaml['education']['relevant-coursework'] = ', '.join(selections['courseworks'])
+    new_yaml['education']['involvement'] = ', '.join(selections['involvements'])
 
-# Fill in experience information
-for exp in experiences:
-    exp_info = find_matching_info('experience', exp)
-    if exp_info:
-        new_yaml['experience'].append(exp_info)
-    else:
-        company = exp.split(':')[0].strip()
-        title = exp.split(':')[1].strip() if ':' in exp else 'Not specified'
-        new_yaml['experience'].append({
-            'company': company,
-            'title': title,
-            'location': 'Not specified',
-            'dates': 'Not specified',
-            'description': ['Description not available']
-        })
-
-# Fill in project information
-for proj in projects:
-    proj_info = find_matching_info('projects', proj)
-    if proj_info:
-        new_yaml['projects'].append(proj_info)
-    else:
-        new_yaml['projects'].append({
-            'title': proj,
-            'date': 'Not specified',
-            'tech': 'Not specified',
-            'description': ['Description not available'],
-            'link': None
-        })
-
-# Fill in research information
-for res in research:
-    res_info = find_matching_info('research', res)
-    if res_info:
+    for res_info in research:
         # Ensure description is a list of strings, not a string representation of a list
-        if isinstance(res_info['description'], str):
-            res_info['description'] = eval(res_info['description'])
-        new_yaml['research'].append(res_info)
-    else:
-        new_yaml['research'].append({
-            'group': 'Research Group',
-            'dates': f"{datetime.now().strftime('%B %Y')} - Present",
-            'description': [res]
-        })
+        res_info['description'] = parse_description(res_info['description'])
+
+    # Sort experience, projects, and research by newest date at the top
+    new_yaml['experience'].sort(key=lambda x: sort_key(x), reverse=True)
+    new_yaml['research'].sort(key=lambda x: sort_key(x), reverse=True)
+
+    # For projects, we need to handle the 'date' field differently
+    new_yaml['projects'].sort(key=lambda x: date_key(parse_date(x.get('date'))), reverse=True)
+    return new_yaml
+
+def reconstruct_resume(selections, resumes):
+    # selections: {selection key: [item names]} from selections_from_results()
+    # or parse_analysis(); resumes: (name, resume) pairs or a ResumeIndex.
+    # Each name is looked up in the parsed resumes. Returns the merged resume dict.
+    index = resumes if isinstance(resumes, ResumeIndex) else ResumeIndex(resumes)
+    basic_info, education = index.basic_info_and_education()
+    experience, projects, research = [], [], []
+
+    # Fill in experience information
+    for exp in selections['experiences']:
+        exp_info = index.find('experience', exp)
+        if exp_info:
+            experience.append(exp_info)
+        else:
+            company = exp.split(':')[0].strip()
+            title = exp.split(':')[1].strip() if ':' in exp else 'Not specified'
+            experience.append({
+                'company': company,
+                'title': title,
+                'location': 'Not specified',
+                'dates': 'Not specified',
+                'description': ['Description not available']
+            })
+
+    # Fill in project information
+    for proj in selections['projects']:
+        proj_info = index.find('projects', proj)
+        if proj_info:
+            projects.append(proj_info)
+        else:
+            projects.append({
+                'title': proj,
+                'date': 'Not specified',
+                'tech': 'Not specified',
+                'description': ['Description not available'],
+                'link': None
+            })
+
+    # Fill in research information
+    for res in selections['research']:
+        res_info = index.find('research', res)
+        if res_info:
+            research.append(res_info)
+        else:
+            research.append({
+                'group': 'Research Group',
+                'dates': f"{datetime.now().strftime('%B %Y')} - Present",
+                'description': [res]
+            })
 
-# Sort experience, projects, and research by newest date at the top
-new_yaml['experience'].sort(key=lambda x: sort_key(x), reverse=True)
-new_yaml['research'].sort(key=lambda x: sort_key(x), reverse=True)
+    return build_resume(basic_info, education, experience, projects, research, selections)
 
-# For projects, we need to handle the 'date' field differently
-new_yaml['projects'].sort(key=lambda x: parse_date(x.get('date', '')), reverse=True)
+def reconstruct_from_handoff(handoff):
+    # Builds the resume from model.scoring_handoff() output. The selected
+    # entries travel with the scores, so nothing is looked up or re-read.
+    base = handoff.get('base') or {}
+    sections = handoff['sections']
+    entries = lambda section: [copy.deepcopy(item['entry']) for item in sections.get(section, [])]
+    selections = {section: [str(item['entry']) for item in sections.get(section, [])]
+                  for section in ('involvements', 'courseworks', 'additional_skills', 'developer_tools',
+                                  'languages', 'technologies')}
+    return build_resume(copy.deepcopy(base.get('information')), copy.deepcopy(base.get('education')),
+                        entries('experiences'), entries('projects'), entries('research'), selections)
 
 # Custom YAML dumper to format lists correctly
 class CustomDumper(yaml.SafeDumper):
     def increase_indent(self, flow=False, indentless=False):
         return super(CustomDumper, self).increase_indent(flow, False)
 
-# Write the new YAML file
-with open('new_resume.yaml', 'w') as file:
-    yaml.dump(new_yaml, file, sort_keys=False, default_flow_style=False, Dumper=CustomDumper)
+def write_resume(resume, output_path):
+    with open(output_path, 'w') as file:
+        yaml.dump(resume, file, sort_keys=False, default_flow_style=False, Dumper=CustomDumper)
+
+def reconstruct_files(analysis_path, directory, output_path):
+    # The file-based step: resume_analysis.txt + parsed resume directory -> YAML file
+    with open(analysis_path, 'r') as file:
+        selections = parse_analysis(file.read())
+    resume = reconstruct_resume(selections, ResumeIndex.from_directory(directory))
+    write_resume(resume, output_path)
+    return resume
+
+def reconstruct_workspace(workspace):
+    # Uses the scoring handoff when the workspace has one, otherwise the text report
+    if not os.path.exists(workspace.handoff_path):
+        return reconstruct_files(workspace.analysis_path, workspace.parsed_dir, workspace.new_resume_path)
+    resume = reconstruct_from_handoff(load_handoff(workspace.handoff_path))
+    write_resume(resume, workspace.new_resume_path)
+    return resume
+
+def main(argv=None):
+    # Inputs and output come from the caller's workspace; without arguments the
+    # paths named by run_timestamp_file.txt are used
+    parser = argparse.ArgumentParser(description='Build the optimized resume YAML from the scoring results.')
+    parser.add_argument('--analysis', help='Path to resume_analysis.txt')
+    parser.add_argument('--parsed-dir', help='Directory of parsed resume YAML files')
+    parser.add_argument('--output', help='Path of the YAML file to write')
+    parser.add_argument('--handoff', help='Path to the scoring handoff JSON; used instead of --analysis and --parsed-dir')
+    args = parser.parse_args(argv)
+
+    if args.handoff:
+        output_path = args.output or Workspace.from_timestamp_files().new_resume_path
+        try:
+            write_resume(reconstruct_from_handoff(load_handoff(args.handoff)), output_path)
+        except ValueError as e:
+            print(f"Error: {e}")
+            exit(1)
+        print(f"New YAML file created successfully: {output_path}")
+        return
+
+    if args.analysis and args.parsed_dir and args.output:
+        analysis_path, directory, output_path = args.analysis, args.parsed_dir, args.output
+    else:
+        workspace = Workspace.from_timestamp_files()
+        analysis_path = args.analysis or workspace.analysis_path
+        directory = args.parsed_dir or workspace.parsed_dir
+        output_path = args.output or workspace.new_resume_path
+
+    try:
+        reconstruct_files(analysis_path, directory, output_path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+    print(f"New YAML file created successfully: {output_path}")
 
-print("New YAML file created successfully: new_resume.yaml")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import re
+
+# The resume structure every parser has to produce. Each field is
+# (name, type, required); nested sections list their own fields. Validation
+# returns a normalized copy in this key order, so everything downstream
+# (scoring, reconstruct.py, generate_resume.py) can rely on the shape.
+
+# Bump whenever the fields or rules change so cached parses are redone
+SCHEMA_VERSION = '1'
+
+STRING = 'string'
+NUMBER = 'number'
+STRING_LIST = 'string_list'
+
+INFORMATION_FIELDS = [
+    ('name', STRING, True),
+    ('location', STRING, False),
+    ('phone', STRING, False),
+    ('email', STRING, True),
+    ('linkedin', STRING, False),
+    ('github', STRING, False),
+]
+
+EDUCATION_FIELDS = [
+    ('school', STRING, True),
+    ('gpa', NUMBER, True),
+    ('graduation', STRING, True),
+    ('degree', STRING, True),
+    ('major', STRING, True),
+    ('location', STRING, True),
+    ('relevant-coursework', STRING, False),
+    ('involvement', STRING, False),
+]
+
+SKILL_FIELDS = [
+    ('languages', STRING, False),
+    ('developer-tools', STRING, False),
+    ('technologies', STRING, False),
+    ('additional-skills', STRING, False),
+]
+
+EXPERIENCE_FIELDS = [
+    ('company', STRING, True),
+    ('title', STRING, False),
+    ('location', STRING, False),
+    ('dates', STRING, False),
+    ('description', STRING_LIST, True),
+]
+
+RESEARCH_FIELDS = [
+    ('group', STRING, True),
+    ('dates', STRING, False),
+    ('description', STRING_LIST, True),
+]
+
+PROJECT_FIELDS = [
+    ('title', STRING, True),
+    ('link', STRING, False),
+    ('date', STRING, False),
+    ('tech', STRING, False),
+    ('description', STRING_LIST, True),
+]
+
+# (section, fields, is a list of entries)
+RESUME_SECTIONS = [
+    ('information', INFORMATION_FIELDS, False),
+    ('education', EDUCATION_FIELDS, False),
+    ('technical-skills', SKILL_FIELDS, False),
+    ('experience', EXPERIENCE_FIELDS, True),
+    ('research', RESEARCH_FIELDS, True),
+    ('projects', PROJECT_FIELDS, True),
+]
+
+
+class ResumeValidationError(ValueError):
+    def __init__(self, errors):
+        super().__init__('Invalid resume: ' + '; '.join(errors))
+        self.errors = errors
+
+
+def normalize_value(value, kind, path, errors):
+    if value is None or value == '' or value == []:
+        return None
+    if kind == STRING:
+        if isinstance(value, (dict, list)):
+            errors.append(f'{path} should be text')
+            return None
+        return str(value).strip() or None
+    if kind == NUMBER:
+        if isinstance(value, bool):
+            errors.append(f'{path} should be a number')
+            return None
+        if isinstance(value, (int, float)):
+            return value
+        # Accept "3.9" or "3.9/4.0" from a model that ignored the prompt
+        match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*(?:/\s*\d+(?:\.\d+)?)?\s*$', str(value))
+        if not match:
+            errors.append(f'{path} should be a number, got {value!r}')
+            return None
+        return float(match.group(1))
+    if kind == STRING_LIST:
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            errors.append(f'{path} should be a list of text')
+            return None
+        items = []
+        for i, item in enumerate(value):
+            if isinstance(item, (dict, list)):
+                errors.append(f'{path}[{i}] should be text')
+            elif item is not None and str(item).strip():
+                items.append(str(item).strip())
+        return items or None
+    raise ValueError(f'Unknown field type: {kind}')
+
+def normalize_fields(data, fields, path, errors):
+    if not isinstance(data, dict):
+        errors.append(f'{path} should be a mapping')
+        return None
+    normalized = {}
+    for name, kind, required in fields:
+        value = normalize_value(data.get(name), kind, f'{path}.{name}', errors)
+        if value is None and required:
+            errors.append(f'{path}.{name} is missing')
+        normalized[name] = value
+    return normalized
+
+def validate_resume(data):
+    # Returns the normalized resume or raises ResumeValidationError listing
+    # every problem found, so a retry can be told exactly what to fix
+    if not isinstance(data, dict):
+        raise ResumeValidationError(['resume should be a mapping'])
+
+    errors = []
+    resume = {}
+    for section, fields, is_list in RESUME_SECTIONS:
+        value = data.get(section)
+        if section not in data:
+            errors.append(f'{section} is missing')
+        if not is_list:
+            resume[section] = normalize_fields(value or {}, fields, section, errors)
+            continue
+        if value is None:
+            value = []
+        if not isinstance(value, list):
+            errors.append(f'{section} should be a list')
+            value = []
+        # Models fill sections the resume doesn't have with one empty
+        # placeholder entry; drop those rather than failing on them
+        entries = [entry for entry in value
+                   if not (isinstance(entry, dict) and not any(entry.values()))]
+        resume[section] = [normalize_fields(entry, fields, f'{section}[{i}]', errors)
+                           for i, entry in enumerate(entries)]
+
+    skills = resume['technical-skills'] or {}
+    if not any(skills.values()):
+        errors.append('technical-skills has no values')
+    if not (resume['experience'] or resume['research'] or resume['projects']):
+        errors.append('resume has no experience, research or projects')
+
+    if errors:
+        raise ResumeValidationError(errors)
+    return resume
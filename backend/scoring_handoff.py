@@ -0,0 +1,28 @@
+import json
+
+# The scoring -> reconstruct handoff: compact JSON built by
+# model.scoring_handoff() and read by reconstruct.reconstruct_from_handoff().
+#
+#   {"version": 1,
+#    "base": {"source": resume name, "information": {...}, "education": {...}},
+#    "sections": {"experiences": [{"entry": {...}, "score": 0.41, "source": resume name}, ...],
+#                 "projects": [...], "research": [...], "involvements": [...], "courseworks": [...],
+#                 "additional_skills": [...], "developer_tools": [...], "languages": [...],
+#                 "technologies": [...]}}
+#
+# Entries are copied as they appear in the parsed resume; skills are merged
+# across resumes and have no single source.
+
+HANDOFF_VERSION = 1
+
+
+def save_handoff(handoff, file_path):
+    with open(file_path, 'w') as f:
+        json.dump(handoff, f, separators=(',', ':'), default=str)
+
+def load_handoff(file_path):
+    with open(file_path, 'r') as f:
+        handoff = json.load(f)
+    if handoff.get('version') != HANDOFF_VERSION:
+        raise ValueError(f"Unsupported scoring handoff version in {file_path}: {handoff.get('version')}")
+    return handoff
@@ -1,18 +1,29 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
 from werkzeug.utils import secure_filename
 from pdf_parser import parse_pdf, save_as_yaml
-import google.generativeai as genai
+from gemini_client import gemini
+from job_fetcher import fetch_job_posting
+from job_postings import save_job_posting
+from posting_cache import JobPostingCache
+from model import ScoringEngine, results_to_dict, load_yaml, score_workspace, main as run_model_analysis
+from reconstruct import reconstruct_from_handoff, reconstruct_workspace
+from workspace import Workspace, is_valid_run_id
+from jobs import JobQueue, JobQueueFull
 import json
-import concurrent.futures
-import time
+import re
+import secrets
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
-import subprocess
+import sys
+from itsdangerous import BadSignature, URLSafeSerializer
 from dotenv import load_dotenv
 load_dotenv()
-apiKey = os.getenv('API_KEY_NAME')
+
+# The resume generator lives next to the backend; its renderer runs in-process
+sys.path.insert(0, os.path.abspath('../resume_generator/scripts'))
+from pdf_service import PdfService, PdfRenderError
+from pdf_cache import PdfCache
 
 app = Flask(__name__, static_folder='./build', static_url_path='/')
 CORS(app)
@@ -22,71 +33,81 @@ def serve():
     return send_from_directory(app.static_folder, 'index.html')
 
 ALLOWED_EXTENSIONS = {'pdf'}
-genai.configure(api_key=apiKey)
-model = genai.GenerativeModel('gemini-1.5-flash')
-
-# Global variable for timestamp
-RUN_TIMESTAMP_FILE = None
-
-def generate_timestamp_and_create_directories_file():
-    global RUN_TIMESTAMP_FILE
-    if RUN_TIMESTAMP_FILE is None:
-        RUN_TIMESTAMP_FILE = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Write timestamp to file
-        with open('run_timestamp_file.txt', 'w') as f:
-            f.write(RUN_TIMESTAMP_FILE)
-        
-        # Create directories
-        for folder in ['uploads', 'parsed_resumes']:
-            folder_path = os.path.join(folder, RUN_TIMESTAMP_FILE)
-            if not os.path.exists(folder_path):
-                os.makedirs(folder_path)
-        
-        app.config['UPLOAD_FOLDER'] = os.path.join('uploads', RUN_TIMESTAMP_FILE)
-
-# Global variable for timestamp
-RUN_TIMESTAMP_LINK = None
-
-def generate_timestamp_and_create_directories_link():
-    global RUN_TIMESTAMP_LINK
-    if RUN_TIMESTAMP_LINK is None:
-        RUN_TIMESTAMP_LINK = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Write timestamp to file
-        with open('run_timestamp_link.txt', 'w') as f:
-            f.write(RUN_TIMESTAMP_LINK)
-        
-        # Create directories
-        for folder in ['job_postings']:
-            folder_path = os.path.join(folder, RUN_TIMESTAMP_LINK)
-            if not os.path.exists(folder_path):
-                os.makedirs(folder_path)
-        
-        app.config['UPLOAD_FOLDER'] = os.path.join('uploads', RUN_TIMESTAMP_LINK)
+
+# Load the scoring engine once so /api/run-model doesn't pay the NLTK/sklearn cold start
+scoring_engine = ScoringEngine()
+
+# LaTeX compiles share a small pool; the preamble format is built on first use
+pdf_service = PdfService(
+    max_workers=int(os.getenv('RESUME_PDF_WORKERS', '2')),
+    timeout=float(os.getenv('RESUME_LATEX_TIMEOUT', '60'))
+)
+
+# Rendered PDFs are content-addressed, so an unchanged resume is never recompiled
+pdf_cache = PdfCache(
+    os.getenv('RESUME_PDF_CACHE_DIR', '../resume_generator/cache/pdfs'),
+    max_bytes=int(os.getenv('RESUME_PDF_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+)
+
+# Background pipeline jobs submitted through /api/jobs
+pipeline_jobs = JobQueue(
+    max_workers=int(os.getenv('PIPELINE_WORKERS', '4')),
+    max_pending=int(os.getenv('PIPELINE_MAX_PENDING', '32'))
+)
+
+# Each browser session gets its own workspace, remembered in a cookie, so
+# concurrent users never share upload folders or intermediate files. The
+# cookie is signed, so only workspace ids this server handed out are
+# accepted; a client can't pick another session's id. Without
+# FLASK_SECRET_KEY the key is random per process and sessions start over
+# when the server restarts.
+WORKSPACE_COOKIE = 'workspace'
+app.secret_key = os.getenv('FLASK_SECRET_KEY') or secrets.token_hex(32)
+workspace_signer = URLSafeSerializer(app.secret_key, salt='workspace')
+
+def get_session_workspace():
+    try:
+        run_id = workspace_signer.loads(request.cookies.get(WORKSPACE_COOKIE) or '')
+    except BadSignature:
+        run_id = None
+    if isinstance(run_id, str) and is_valid_run_id(run_id):
+        workspace = Workspace(run_id)
+    else:
+        workspace = Workspace()
+        g.new_workspace = workspace.run_id
+    return workspace.create()
+
+@app.after_request
+def remember_workspace(response):
+    if 'new_workspace' in g:
+        response.set_cookie(WORKSPACE_COOKIE, workspace_signer.dumps(g.new_workspace), httponly=True, samesite='Lax')
+    return response
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def process_file(file):
+def parse_resume_file(file_path, parsed_dir):
+    parsed_data = parse_pdf(file_path)
+
+    if parsed_data:
+        filename = os.path.basename(file_path)
+        yaml_filename = f"{filename.rsplit('.', 1)[0]}.yaml"
+        save_as_yaml(parsed_data, os.path.join(parsed_dir, yaml_filename))
+        return True
+    return False
+
+def process_file(file, workspace):
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        file_path = os.path.join(workspace.upload_dir, filename)
         file.save(file_path)
-        
-        parsed_data = parse_pdf(file_path)
-        
-        if parsed_data:
-            yaml_filename = f"{filename.rsplit('.', 1)[0]}.yaml"
-            yaml_path = os.path.join('parsed_resumes', RUN_TIMESTAMP_FILE, yaml_filename)
-            save_as_yaml(parsed_data, yaml_path)
-            return True
+        return parse_resume_file(file_path, workspace.parsed_dir)
     return False
 
 @app.route('/upload', methods=['POST'])
 def upload_files():
-    generate_timestamp_and_create_directories_file()
-    
+    workspace = get_session_workspace()
+
     if 'file0' not in request.files:
         return jsonify({'error': 'No file part'}), 400
     
@@ -102,7 +123,7 @@ def upload_files():
     errors = []
 
     with ThreadPoolExecutor() as executor:
-        future_to_file = {executor.submit(process_file_with_delay, file, i): file for i, file in enumerate(files)}
+        future_to_file = {executor.submit(process_file, file, workspace): file for file in files}
         for future in as_completed(future_to_file):
             file = future_to_file[future]
             try:
@@ -125,16 +146,58 @@ def upload_files():
     else:
         return jsonify({'error': 'Failed to parse any files. ' + '; '.join(errors)}), 500
 
-def process_file_with_delay(file, index):
-    result = process_file(file)
-    time.sleep(3.5)  # 3.5 seconds delay between files
-    return result
+JSON_BLOCK_PATTERN = re.compile(r'```(?:json)?[ \t]*\n(.*?)```', re.DOTALL | re.IGNORECASE)
+
+def extract_job_posting(job_posting_content):
+    # Prompt for Gemini API
+    prompt = f"""
+    Analyze the following job posting and extract these key elements:
+    1. Job Title
+    2. Company Name
+    3. Job Description (summarized)
+    4. Required Education
+    5. Required Skills
+    6. Key Responsibilities
+    7. Experience Level
+    8. Location (if mentioned)
+    9. Employment Type (full-time, part-time, contract, internship, etc.)
+    10. Top 20 Keywords
+
+    Present the information in a JSON format.
+
+    Job Posting:
+    {job_posting_content}
+    """
+
+    # Generate response using the shared Gemini client
+    content = gemini.generate_text(prompt)
+
+    # The JSON usually comes inside a ```json fence
+    match = JSON_BLOCK_PATTERN.search(content)
+    if match:
+        content = match.group(1)
+
+    # Parse the JSON response
+    return json.loads(content)
+
+# Extracted postings by URL, revalidated with ETag/Last-Modified once they
+# are older than JOB_POSTING_FRESH_SECONDS
+job_posting_cache = JobPostingCache(
+    fetch_job_posting,
+    extract_job_posting,
+    db_path=os.getenv('JOB_POSTING_CACHE_PATH', os.path.join('cache', 'job_postings.sqlite3')),
+    fresh_seconds=float(os.getenv('JOB_POSTING_FRESH_SECONDS', '3600'))
+)
+
+def scrape_job_posting_to(link, directory):
+    # Repeat links are served from the cache; new ones are fetched with
+    # timeouts and a size cap, reduced to the posting text and extracted
+    posting = job_posting_cache.get(link)
+    return save_job_posting(posting, directory)
 
 @app.route('/scrape-job-posting', methods=['POST'])
 def scrape_job_posting():
-    generate_timestamp_and_create_directories_link()
-    if RUN_TIMESTAMP_LINK is None:
-        return jsonify({'error': 'Upload route must be called first to generate timestamp'}), 400
+    workspace = get_session_workspace()
 
     link = request.json.get('link')
     print("LINK",link)
@@ -142,77 +205,7 @@ def scrape_job_posting():
         return jsonify({'error': 'No link provided'}), 400
 
     try:
-        # Use requests to get the content of the job posting
-        import requests
-        response = requests.get(link)
-        job_posting_content = response.text
-        # Prompt for Gemini API
-        prompt = f"""
-        Analyze the following job posting and extract these key elements:
-        1. Job Title
-        2. Company Name
-        3. Job Description (summarized)
-        4. Required Education
-        5. Required Skills
-        6. Key Responsibilities
-        7. Experience Level
-        8. Location (if mentioned)
-        9. Employment Type (full-time, part-time, contract, internship, etc.)
-        10. Top 20 Keywords
-
-        Present the information in a JSON format.
-
-        Job Posting:
-        {job_posting_content}
-        """
-
-        # Generate response using Gemini API
-        response = model.generate_content(prompt)
-
-        content = response.candidates[0].content.parts[0].text
-        
-        # Remove the first and last lines of the response text
-        lines = content.split('\n')
-        if len(lines) > 2:
-            lines = lines[1:-1]
-        content = "\n".join(lines)
-
-        # print(content)
-
-        # Parse the JSON response
-        parsed_info = json.loads(content)
-
-        # Prepare the formatted job posting
-        formatted_posting = f"""
-Job Title: {parsed_info.get('Job Title', 'N/A')}
-Company: {parsed_info.get('Company Name', 'N/A')}
-
-Description:
-{parsed_info.get('Job Description', 'N/A')}
-
-Education Requirements:
-{parsed_info.get('Required Education', 'Not specified')}
-
-Skills:
-{', '.join(parsed_info.get('Required Skills', []))}
-
-Key Responsibilities:
-{', '.join(parsed_info.get('Key Responsibilities', []))}
-
-Experience Level: {parsed_info.get('Experience Level', 'N/A')}
-Location: {parsed_info.get('Location', 'N/A')}
-Employment Type: {parsed_info.get('Employment Type', 'N/A')}
-
-Keywords:
-{', '.join(parsed_info.get('Top 20 Keywords', []))}
-"""
-
-        # Save the formatted job posting
-        filename = secure_filename(f"{parsed_info['Company Name']}_{parsed_info['Job Title']}.txt")
-        file_path = os.path.join('job_postings', RUN_TIMESTAMP_LINK, filename)
-        with open(file_path, 'w') as f:
-            f.write(formatted_posting)
-
+        scrape_job_posting_to(link, workspace.job_postings_dir)
         return jsonify({'message': 'Job posting scraped and saved successfully'}), 200
 
     except Exception as e:
@@ -220,36 +213,134 @@ Keywords:
 
 
 
+def generate_resume_pdf(data):
+    # Rendered in-process; each job compiles in its own temp directory.
+    # Returns the PDF's content-addressed file name in pdf_cache.
+    return os.path.basename(pdf_service.render_cached(data, pdf_cache))
+
 @app.route('/api/run-model', methods=['POST'])
 def run_model():
     try:
-        subprocess.run(['python', 'model.py'], check=True)
-        return jsonify({'message': 'Model run successfully'}), 200
-    except subprocess.CalledProcessError as e:
+        # Only the handoff for /api/run-reconstruct is saved; the text reports are for the CLI
+        results = run_model_analysis(scoring_engine, get_session_workspace(), write_reports=False)
+        return jsonify({'message': 'Model run successfully', 'results': results_to_dict(results)}), 200
+    except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/run-reconstruct', methods=['POST'])
 def run_reconstruct():
     try:
-        subprocess.run(['python', 'reconstruct.py'], check=True)
+        reconstruct_workspace(get_session_workspace())
         return jsonify({'message': 'Reconstruct run successfully'}), 200
-    except subprocess.CalledProcessError as e:
+    except (OSError, ValueError) as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/generate-resume', methods=['POST'])
 def generate_resume():
+    workspace = get_session_workspace()
     try:
-        subprocess.run(['python', 'scripts/generate_resume.py', '../backend/new_resume.yaml', 'output.tex'], cwd='../resume_generator', check=True)
-        pdf_path = '../resume_generator/outputs/output.pdf'
-        if os.path.exists(pdf_path):
-            return jsonify({'pdfUrl': f'/download-pdf/output.pdf'}), 200
-        else:
-            return jsonify({'error': 'PDF file not generated'}), 500
-    except subprocess.CalledProcessError as e:
+        pdf_name = generate_resume_pdf(load_yaml(workspace.new_resume_path))
+        return jsonify({'pdfUrl': f'/download-pdf/{pdf_name}'}), 200
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 500
+    except PdfRenderError as e:
         return jsonify({'error': str(e)}), 500
 
+# Pipeline stages for /api/jobs. Each receives the job payload dict.
+def parse_job_resumes(payload):
+    workspace = payload['workspace']
+    with ThreadPoolExecutor() as executor:
+        parsed = list(executor.map(lambda path: parse_resume_file(path, workspace.parsed_dir), payload['pdf_paths']))
+    if not any(parsed):
+        raise RuntimeError('Failed to parse any files')
+
+def scrape_job_link(payload):
+    scrape_job_posting_to(payload['link'], payload['workspace'].job_postings_dir)
+
+def score_job(payload):
+    payload['analysis'], payload['handoff'] = score_workspace(scoring_engine, payload['workspace'])
+
+def render_job(payload):
+    # The score stage's handoff goes straight into the merged resume, with
+    # no report files, YAML lookups or new_resume.yaml round-trip
+    pdf_name = generate_resume_pdf(reconstruct_from_handoff(payload['handoff']))
+    return {'pdfUrl': f'/download-pdf/{pdf_name}', 'results': results_to_dict(payload['analysis'])}
+
+PIPELINE_STAGES = [
+    ('parse', parse_job_resumes),
+    ('scrape', scrape_job_link),
+    ('score', score_job),
+    ('render', render_job)
+]
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    files = [file for key, file in request.files.items() if key.startswith('file')]
+    link = request.form.get('link')
+
+    if len(files) == 0:
+        return jsonify({'error': 'No selected files'}), 400
+    if len(files) > 5:
+        return jsonify({'error': 'Maximum 5 files allowed'}), 400
+    if not link:
+        return jsonify({'error': 'No link provided'}), 400
+
+    workspace = Workspace().create()
+    payload = {'workspace': workspace, 'link': link, 'pdf_paths': []}
+
+    # Save the PDFs now; the request's file streams are gone once we return
+    for file in files:
+        if file and allowed_file(file.filename):
+            file_path = os.path.join(workspace.upload_dir, secure_filename(file.filename))
+            file.save(file_path)
+            payload['pdf_paths'].append(file_path)
+    if not payload['pdf_paths']:
+        return jsonify({'error': 'No PDF files provided'}), 400
+
+    try:
+        job = pipeline_jobs.submit(PIPELINE_STAGES, payload)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'job_id': job.id, 'status_url': f'/api/jobs/{job.id}'}), 202
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    job = pipeline_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    job = pipeline_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    # Server-sent events: one message per status change until the job finishes
+    def stream():
+        version = None
+        while True:
+            if job.version != version:
+                version = job.version
+                yield f"data: {json.dumps(job.to_dict(), default=str)}\n\n"
+                if job.finished:
+                    return
+            elif job.wait_for_update(version, timeout=15) == version:
+                yield ": keep-alive\n\n"
+
+    return Response(stream(), mimetype='text/event-stream')
+
 @app.route('/download-pdf/<filename>')
 def download_pdf(filename):
+    if pdf_cache.is_entry_name(filename):
+        # A content-addressed name never changes its bytes: the hash is a
+        # strong ETag and browsers and proxies may keep the file for good
+        response = send_from_directory(pdf_cache.directory, filename, as_attachment=True,
+                                       download_name='resume.pdf', etag=filename[:-len('.pdf')],
+                                       max_age=31536000)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
     return send_from_directory('../resume_generator/outputs', filename, as_attachment=True)
     
 # Serve static files
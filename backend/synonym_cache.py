@@ -0,0 +1,85 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class SynonymCache:
+    # Bounded LRU cache for synonym lookups, backed by a sqlite table so a
+    # freshly started worker can reuse expansions computed by earlier ones.
+    # lookup is called on a miss and must return a list of strings.
+    def __init__(self, lookup, db_path=None, max_size=4096):
+        self.lookup = lookup
+        self.db_path = db_path
+        self.max_size = max_size
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.db_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS synonyms (word TEXT PRIMARY KEY, synonyms TEXT NOT NULL)')
+            self._connection.commit()
+        return self._connection
+
+    def _load(self, word):
+        row = self._connect().execute('SELECT synonyms FROM synonyms WHERE word = ?', (word,)).fetchone()
+        return tuple(json.loads(row[0])) if row else None
+
+    def _store(self, word, synonyms):
+        connection = self._connect()
+        connection.execute('INSERT OR REPLACE INTO synonyms (word, synonyms) VALUES (?, ?)', (word, json.dumps(list(synonyms))))
+        connection.commit()
+
+    def _remember(self, word, synonyms):
+        self._entries[word] = synonyms
+        self._entries.move_to_end(word)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, word):
+        with self._lock:
+            synonyms = self._entries.get(word)
+            if synonyms is not None:
+                self._entries.move_to_end(word)
+                self.hits += 1
+                return list(synonyms)
+
+            if self.db_path:
+                synonyms = self._load(word)
+            if synonyms is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                synonyms = tuple(self.lookup(word))
+                if self.db_path:
+                    self._store(word, synonyms)
+
+            self._remember(word, synonyms)
+            return list(synonyms)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size
+            }
+
+    def clear(self):
+        # Drop the in-memory entries and the persistent table
+        with self._lock:
+            self._entries.clear()
+            if self.db_path:
+                self._connect().execute('DELETE FROM synonyms')
+                self._connection.commit()
@@ -0,0 +1,355 @@
+from collections import deque
+
+# Skill categories used to expand job-description words and resume items with
+# related terms. A category fires when any of its keywords (or high-priority
+# words) appears, case-insensitively, as a substring of the text.
+CATEGORY_TAXONOMY = [
+    # Programming languages and frameworks
+    {
+        'name': 'programming',
+        'high_priority': ['Python', 'Java', 'JavaScript', 'C++', 'SQL'],
+        'keywords': [
+            'Python', 'Java', 'JavaScript', 'C', 'C++', 'C#', 'Ruby', 'PHP', 'Swift', 'Kotlin',
+            'TypeScript', 'Rust', 'Go', 'Perl', 'Scala', 'Haskell', 'Lua', 'Objective-C', 'Assembly',
+            'SQL', 'HTML', 'CSS', 'XML', 'JSON', 'YAML', 'Markdown', 'VBScript', 'Bash', 'PowerShell',
+            'Node.js', 'React', 'Angular', 'Vue.js', 'Express.js', 'Django', 'Flask', 'Spring', 'ASP.NET',
+            'Ruby on Rails', 'Symfony', 'Laravel', 'Jinja', 'Hibernate', 'jQuery', 'Bootstrap', 'Tailwind CSS',
+            'OpenGL', 'Unity', 'Qt', 'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'Pandas', 'NumPy',
+            'Matplotlib', 'D3.js', 'Redux', 'RxJS', 'Mocha', 'JUnit', 'Selenium', 'Jest', 'Chai',
+            'Apache Kafka', 'RabbitMQ', 'GraphQL', 'RESTful', 'SOAP', 'Microservices', 'Serverless',
+            'Algorithms', 'Data Structures', 'Machine Learning', 'Deep Learning', 'Artificial Intelligence'
+        ],
+        'related_terms': ['programming', 'coding', 'development', 'software', 'algorithm', 'framework', 'library']
+    },
+    # Databases
+    {
+        'name': 'database',
+        'high_priority': ['MySQL', 'PostgreSQL', 'MongoDB', 'Oracle', 'SQL Server'],
+        'keywords': [
+            'MySQL', 'PostgreSQL', 'MongoDB', 'Oracle', 'SQL Server', 'SQLite', 'Redis', 'Cassandra',
+            'MariaDB', 'Elasticsearch', 'DynamoDB', 'Couchbase', 'Firebase', 'Neo4j', 'Hive', 'HBase',
+            'Teradata', 'Snowflake', 'BigQuery', 'Redshift', 'Vertica', 'Splunk', 'Databricks'
+        ],
+        'related_terms': ['database', 'DBMS', 'SQL', 'NoSQL', 'data storage', 'query']
+    },
+    # Cloud platforms
+    {
+        'name': 'cloud',
+        'high_priority': ['AWS', 'Azure', 'Google Cloud', 'Kubernetes', 'Docker'],
+        'keywords': [
+            'AWS', 'Amazon Web Services', 'Azure', 'Microsoft Azure', 'Google Cloud Platform', 'GCP',
+            'Heroku', 'DigitalOcean', 'IBM Cloud', 'Oracle Cloud', 'Alibaba Cloud', 'VMware',
+            'OpenStack', 'Rackspace', 'Salesforce', 'SAP', 'Workday', 'ServiceNow', 'Kubernetes',
+            'Docker', 'Terraform', 'Ansible', 'Chef', 'Puppet', 'Jenkins', 'GitLab CI/CD', 'CircleCI'
+        ],
+        'related_terms': ['cloud computing', 'IaaS', 'PaaS', 'SaaS', 'virtualization', 'scalability', 'containerization']
+    },
+    # Version control and collaboration tools
+    {
+        'name': 'vcs',
+        'high_priority': ['Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN'],
+        'keywords': [
+            'Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN', 'Subversion', 'Mercurial',
+            'Perforce', 'Azure DevOps', 'Jira', 'Confluence', 'Trello', 'Asana', 'Slack',
+            'Microsoft Teams', 'Zoom', 'Skype', 'Notion', 'Basecamp', 'Figma', 'Miro'
+        ],
+        'related_terms': ['version control', 'collaboration', 'project management', 'code repository', 'team communication']
+    },
+    # Operating systems
+    {
+        'name': 'os',
+        'high_priority': ['Linux', 'Windows', 'macOS', 'Unix', 'Android'],
+        'keywords': [
+            'Linux', 'Windows', 'macOS', 'Unix', 'Android', 'iOS', 'Ubuntu', 'Debian',
+            'CentOS', 'Red Hat', 'Fedora', 'Arch Linux', 'FreeBSD', 'OpenBSD', 'Solaris',
+            'Chrome OS', 'Raspberry Pi OS', 'SUSE', 'Kali Linux', 'Embedded systems'
+        ],
+        'related_terms': ['operating system', 'OS', 'kernel', 'system administration', 'shell']
+    },
+    # Web technologies
+    {
+        'name': 'web',
+        'high_priority': ['HTML', 'CSS', 'JavaScript', 'RESTful API', 'HTTPS'],
+        'keywords': [
+            'HTML', 'CSS', 'JavaScript', 'DOM', 'AJAX', 'JSON', 'XML', 'RESTful API',
+            'SOAP', 'WebSocket', 'OAuth', 'JWT', 'CORS', 'SSL/TLS', 'HTTPS', 'HTTP/2',
+            'WebRTC', 'Progressive Web Apps', 'Single Page Applications', 'Server-Side Rendering',
+            'Web Components', 'Web Assembly', 'Web Workers', 'Service Workers', 'IndexedDB'
+        ],
+        'related_terms': ['web development', 'front-end', 'back-end', 'full-stack', 'responsive design', 'web security']
+    },
+    # Data science and analytics
+    {
+        'name': 'data_science',
+        'high_priority': ['Machine Learning', 'Data Analysis', 'Statistics', 'Big Data', 'Data Visualization'],
+        'keywords': [
+            'Machine Learning', 'Deep Learning', 'Artificial Intelligence', 'Data Analysis',
+            'Statistics', 'Big Data', 'Data Mining', 'Data Visualization', 'Predictive Modeling',
+            'Natural Language Processing', 'Computer Vision', 'Time Series Analysis',
+            'Regression', 'Classification', 'Clustering', 'Dimensionality Reduction',
+            'Feature Engineering', 'A/B Testing', 'Hypothesis Testing', 'Bayesian Inference',
+            'Neural Networks', 'Random Forests', 'Support Vector Machines', 'K-means',
+            'Principal Component Analysis', 'Reinforcement Learning', 'Ensemble Methods'
+        ],
+        'related_terms': ['data science', 'analytics', 'predictive modeling', 'statistical analysis', 'machine learning']
+    },
+    # DevOps and infrastructure
+    {
+        'name': 'devops',
+        'high_priority': ['CI/CD', 'Infrastructure as Code', 'Monitoring', 'Containerization', 'Configuration Management'],
+        'keywords': [
+            'CI/CD', 'Continuous Integration', 'Continuous Deployment', 'Infrastructure as Code',
+            'Configuration Management', 'Monitoring', 'Logging', 'Alerting', 'Containerization',
+            'Orchestration', 'Load Balancing', 'Auto-scaling', 'Service Discovery', 'Microservices',
+            'Serverless', 'Site Reliability Engineering', 'DevSecOps', 'GitOps', 'Chaos Engineering',
+            'Blue-Green Deployment', 'Canary Releases', 'Feature Flags', 'Distributed Tracing'
+        ],
+        'related_terms': ['DevOps', 'infrastructure', 'automation', 'deployment', 'monitoring', 'scalability']
+    },
+    # Networking
+    {
+        'name': 'networking',
+        'high_priority': ['TCP/IP', 'DNS', 'DHCP', 'VPN', 'Firewall'],
+        'keywords': [
+            'TCP/IP', 'UDP', 'HTTP', 'HTTPS', 'FTP', 'SSH', 'DNS', 'DHCP', 'VPN', 'Firewall',
+            'Router', 'Switch', 'Load Balancer', 'Proxy', 'CDN', 'NAT', 'VLAN', 'SDN',
+            'BGP', 'OSPF', 'MPLS', 'IPsec', 'SSL/TLS', 'SMTP', 'POP3', 'IMAP', 'VoIP'
+        ],
+        'related_terms': ['networking', 'protocols', 'network security', 'network infrastructure', 'connectivity']
+    },
+    # Cybersecurity
+    {
+        'name': 'security',
+        'high_priority': ['Encryption', 'Penetration Testing', 'Firewall', 'Intrusion Detection', 'Authentication'],
+        'keywords': [
+            'Encryption', 'Cryptography', 'Penetration Testing', 'Vulnerability Assessment',
+            'Firewall', 'Intrusion Detection System', 'Intrusion Prevention System',
+            'Authentication', 'Authorization', 'Access Control', 'SIEM', 'Incident Response',
+            'Malware Analysis', 'Forensics', 'Risk Assessment', 'Compliance', 'DDoS',
+            'Phishing', 'Social Engineering', 'Zero Trust', 'Threat Intelligence'
+        ],
+        'related_terms': ['cybersecurity', 'information security', 'network security', 'data protection', 'threat prevention']
+    },
+    # Mobile development
+    {
+        'name': 'mobile',
+        'high_priority': ['iOS', 'Android', 'React Native', 'Flutter', 'Kotlin'],
+        'keywords': [
+            'iOS', 'Android', 'React Native', 'Flutter', 'Xamarin', 'Ionic', 'PhoneGap',
+            'Swift', 'Objective-C', 'Java', 'Kotlin', 'Mobile UI/UX', 'App Store',
+            'Google Play Store', 'Mobile Analytics', 'Push Notifications', 'Geolocation',
+            'Augmented Reality', 'Virtual Reality', 'Mobile Security', 'Offline Storage'
+        ],
+        'related_terms': ['mobile development', 'app development', 'cross-platform', 'mobile UI/UX', 'mobile security']
+    },
+    # Communication and teamwork
+    {
+        'name': 'communication',
+        'high_priority': ['Collaboration', 'Leadership', 'Presentation', 'Negotiation', 'Conflict Resolution'],
+        'keywords': [
+            'Collaboration', 'Leadership', 'Presentation', 'Negotiation', 'Conflict Resolution',
+            'Team Building', 'Active Listening', 'Interpersonal Skills', 'Public Speaking',
+            'Emotional Intelligence', 'Cross-functional Coordination', 'Stakeholder Management',
+            'Facilitation', 'Mentoring', 'Coaching', 'Cultural Awareness', 'Virtual Collaboration'
+        ],
+        'related_terms': ['communication', 'teamwork', 'leadership', 'interpersonal skills', 'collaboration']
+    },
+    # Marketing and sales
+    {
+        'name': 'marketing',
+        'high_priority': ['Digital Marketing', 'SEO', 'Content Marketing', 'Social Media Marketing', 'CRM'],
+        'keywords': [
+            'Digital Marketing', 'SEO', 'Content Marketing', 'Social Media Marketing', 'CRM',
+            'Brand Management', 'Market Research', 'Email Marketing', 'PPC', 'Affiliate Marketing',
+            'Marketing Analytics', 'Public Relations', 'Sales Strategy', 'Lead Generation',
+            'Customer Acquisition', 'Revenue Growth', 'Product Marketing', 'Marketing Automation'
+        ],
+        'related_terms': ['marketing', 'sales', 'branding', 'customer acquisition', 'revenue growth']
+    },
+    # Finance and accounting
+    {
+        'name': 'finance',
+        'high_priority': ['Financial Analysis', 'Budgeting', 'Forecasting', 'Risk Management', 'Financial Reporting'],
+        'keywords': [
+            'Financial Analysis', 'Budgeting', 'Forecasting', 'Risk Management', 'Financial Reporting',
+            'Accounting', 'Auditing', 'Taxation', 'Financial Modeling', 'Valuation', 'M&A',
+            'Corporate Finance', 'Investment Banking', 'Financial Planning', 'Cost Accounting',
+            'Treasury Management', 'GAAP', 'IFRS', 'Financial Controls', 'Profit & Loss'
+        ],
+        'related_terms': ['finance', 'accounting', 'financial management', 'budgeting', 'financial analysis']
+    },
+    # Human resources and recruiting
+    {
+        'name': 'hr',
+        'high_priority': ['Talent Acquisition', 'Employee Relations', 'Performance Management', 'Compensation', 'HR Analytics'],
+        'keywords': [
+            'Talent Acquisition', 'Employee Relations', 'Performance Management', 'Compensation',
+            'HR Analytics', 'Benefits Administration', 'HRIS', 'Workforce Planning', 'Training & Development',
+            'Succession Planning', 'Labor Law', 'Diversity & Inclusion', 'Employee Engagement',
+            'Organizational Development', 'HR Policies', 'Onboarding', 'Talent Management'
+        ],
+        'related_terms': ['human resources', 'recruiting', 'talent management', 'employee relations', 'HR strategy']
+    },
+    # Writing and content creation
+    {
+        'name': 'writing',
+        'high_priority': ['Content Strategy', 'Copywriting', 'Technical Writing', 'Editing', 'SEO Writing'],
+        'keywords': [
+            'Content Strategy', 'Copywriting', 'Technical Writing', 'Editing', 'SEO Writing',
+            'Blogging', 'Journalism', 'Creative Writing', 'Content Marketing', 'Proofreading',
+            'Storytelling', 'Grant Writing', 'UX Writing', 'Scriptwriting', 'White Papers',
+            'Content Management', 'Editorial Planning', 'Content Optimization'
+        ],
+        'related_terms': ['writing', 'content creation', 'editing', 'content strategy', 'copywriting']
+    },
+    # Customer support and service
+    {
+        'name': 'customer_service',
+        'high_priority': ['Customer Experience', 'Customer Retention', 'Help Desk', 'Conflict Resolution', 'CRM'],
+        'keywords': [
+            'Customer Experience', 'Customer Retention', 'Help Desk', 'Conflict Resolution', 'CRM',
+            'Customer Satisfaction', 'Technical Support', 'Call Center Operations', 'Customer Feedback',
+            'Service Level Agreements', 'Customer Onboarding', 'Complaint Resolution', 'Live Chat Support',
+            'Customer Success', 'Account Management', 'Ticketing Systems', 'Customer Loyalty'
+        ],
+        'related_terms': ['customer support', 'customer service', 'customer experience', 'client relations', 'technical support']
+    },
+    # Legal and compliance
+    {
+        'name': 'legal',
+        'high_priority': ['Contract Law', 'Intellectual Property', 'Regulatory Compliance', 'Corporate Law', 'Data Privacy'],
+        'keywords': [
+            'Contract Law', 'Intellectual Property', 'Regulatory Compliance', 'Corporate Law', 'Data Privacy',
+            'Litigation', 'Legal Research', 'Due Diligence', 'Risk Assessment', 'GDPR', 'HIPAA',
+            'Employment Law', 'Mergers & Acquisitions', 'Antitrust', 'Patent Law', 'Trademark Law',
+            'Legal Writing', 'Negotiation', 'Arbitration', 'Mediation', 'Ethics'
+        ],
+        'related_terms': ['legal', 'compliance', 'regulations', 'contracts', 'intellectual property']
+    },
+    # Education and training
+    {
+        'name': 'education',
+        'high_priority': ['Curriculum Development', 'Instructional Design', 'E-learning', 'Assessment', 'Adult Learning'],
+        'keywords': [
+            'Curriculum Development', 'Instructional Design', 'E-learning', 'Assessment', 'Adult Learning',
+            'Learning Management Systems', 'Blended Learning', 'Educational Technology', 'Training Facilitation',
+            'Course Creation', 'Student Engagement', 'Pedagogy', 'Classroom Management', 'Special Education',
+            'STEM Education', 'Distance Learning', 'Educational Psychology', 'Professional Development'
+        ],
+        'related_terms': ['education', 'training', 'teaching', 'learning', 'instructional design']
+    },
+    # Healthcare and medical
+    {
+        'name': 'healthcare',
+        'high_priority': ['Patient Care', 'Electronic Health Records', 'Medical Coding', 'Clinical Research', 'Healthcare Compliance'],
+        'keywords': [
+            'Patient Care', 'Electronic Health Records', 'Medical Coding', 'Clinical Research', 'Healthcare Compliance',
+            'Nursing', 'Pharmacy', 'Medical Devices', 'Health Informatics', 'Telemedicine', 'Public Health',
+            'Healthcare Administration', 'Medical Billing', 'HIPAA', 'Biotechnology', 'Pharmacology',
+            'Diagnostics', 'Medical Imaging', 'Healthcare Policy', 'Patient Safety', 'Epidemiology'
+        ],
+        'related_terms': ['healthcare', 'medical', 'patient care', 'clinical', 'health informatics']
+    },
+    # Design and creative arts
+    {
+        'name': 'design',
+        'high_priority': ['UX/UI Design', 'Graphic Design', 'Visual Design', 'Product Design', 'Web Design'],
+        'keywords': [
+            'UX/UI Design', 'Graphic Design', 'Visual Design', 'Product Design', 'Web Design',
+            'Branding', 'Typography', 'Illustration', 'Animation', '3D Modeling', 'CAD',
+            'Industrial Design', 'Interior Design', 'Fashion Design', 'Game Design',
+            'Motion Graphics', 'Photography', 'Art Direction', 'Creative Direction'
+        ],
+        'related_terms': ['design', 'creative arts', 'visual communication', 'aesthetics', 'user experience']
+    },
+    # Quant finance/trading/quant software development
+    {
+        'name': 'quant',
+        'high_priority': ['Algorithmic Trading', 'Risk Modeling', 'Quantitative Analysis', 'Financial Engineering', 'High-Frequency Trading'],
+        'keywords': [
+            'Algorithmic Trading', 'Risk Modeling', 'Quantitative Analysis', 'Financial Engineering', 'High-Frequency Trading',
+            'Statistical Arbitrage', 'Options Pricing', 'Portfolio Optimization', 'Time Series Analysis',
+            'Market Microstructure', 'Derivatives', 'Stochastic Calculus', 'Machine Learning in Finance',
+            'Econometrics', 'Quantitative Research', 'Volatility Modeling', 'Backtesting', 'Order Execution', 'stock'
+        ],
+        'related_terms': ['quantitative finance', 'algorithmic trading', 'financial modeling', 'risk analysis', 'quant development']
+    }
+]
+
+
+class TaxonomyMatcher:
+    # Aho-Corasick automaton over every lowercased category keyword. Matching a
+    # text is one pass over its characters and reports all categories at once,
+    # including keywords that overlap or sit inside other keywords.
+    def __init__(self, categories):
+        self.categories = categories
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [0]
+        for index, category in enumerate(categories):
+            for keyword in category['keywords'] + category['high_priority']:
+                self._add_keyword(keyword.lower(), index)
+        self._build_fail_links()
+        self._alphabet = set(ch for transitions in self._goto for ch in transitions)
+        self._all_categories = (1 << len(categories)) - 1
+        self._terms_by_mask = {}
+
+    def _add_keyword(self, keyword, category_index):
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(0)
+                self._goto[state][ch] = next_state
+            state = next_state
+        self._outputs[state] |= 1 << category_index
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                self._outputs[next_state] |= self._outputs[self._fail[next_state]]
+
+    def match(self, text):
+        # Bitmask of the categories whose keywords occur in text
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        alphabet = self._alphabet
+        state = 0
+        found = 0
+        for ch in text.lower():
+            if ch not in alphabet:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+                if found == self._all_categories:
+                    break
+        return found
+
+    def related_terms(self, text):
+        mask = self.match(text)
+        terms = self._terms_by_mask.get(mask)
+        if terms is None:
+            terms = []
+            for index, category in enumerate(self.categories):
+                if mask & (1 << index):
+                    terms.extend(category['related_terms'])
+            self._terms_by_mask[mask] = terms
+        return list(terms)
+
+
+TAXONOMY_MATCHER = TaxonomyMatcher(CATEGORY_TAXONOMY)
@@ -0,0 +1,296 @@
+import re
+import unicodedata
+from resume_schema import validate_resume, ResumeValidationError
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+# Local resume parsing from the PDF text layer. Resumes exported from LaTeX or
+# Word keep their text with positions, which is enough to rebuild the same
+# YAML structure the Gemini prompt asks for without rasterizing anything.
+
+# Bump whenever the mapping below changes so cached parses are redone
+TEXT_LAYER_VERSION = '2'
+
+SECTION_HEADINGS = {
+    'education': 'education',
+    'technical skills': 'technical-skills',
+    'skills': 'technical-skills',
+    'experience': 'experience',
+    'work experience': 'experience',
+    'professional experience': 'experience',
+    'research': 'research',
+    'research experience': 'research',
+    'projects': 'projects',
+}
+
+SKILL_LABELS = [
+    ('language', 'languages'),
+    ('developer', 'developer-tools'),
+    ('tool', 'developer-tools'),
+    ('technolog', 'technologies'),
+    ('framework', 'technologies'),
+    ('additional', 'additional-skills'),
+    ('other', 'additional-skills'),
+    ('skill', 'additional-skills'),
+]
+
+BULLETS = {'•', '◦', '▪', '‣', '–', '-', '*', '●', '○', '■'}
+
+# Characters the Gemini prompt asks to be replaced by plain ASCII
+CHARACTER_REPLACEMENTS = {
+    '–': '-', '—': '-', '‐': '-', '−': '-',
+    '’': "'", '‘': "'", '“': '"', '”': '"',
+    ' ': ' ',
+}
+
+# Words closer than this (in points) belong to the same word; kerned glyph
+# runs like "T ools" come out whole this way
+WORD_GAP = 1.0
+# Gap that separates a left-aligned value from a right-aligned one on the
+# same line (dates and locations in the subheadings)
+COLUMN_GAP = 12.0
+# Vertical distance under which words are treated as the same line; bullets
+# and right-aligned dates sit a point or two off the text baseline
+LINE_TOLERANCE = 3.0
+# Indentation past the left margin that marks bullet text and continuations
+INDENT = 8.0
+
+PHONE_PATTERN = re.compile(r'^\+?[\d\s().-]{7,}$')
+GPA_PATTERN = re.compile(r'\(?\s*GPA\s*:?\s*([\d.]+)\s*(?:/\s*[\d.]+)?\s*\)?', re.IGNORECASE)
+
+
+def clean_text(text):
+    text = unicodedata.normalize('NFKC', text)
+    for character, replacement in CHARACTER_REPLACEMENTS.items():
+        text = text.replace(character, replacement)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def join_words(words):
+    text = ''
+    previous = None
+    for word in words:
+        if previous is not None and word['x0'] - previous['x1'] > WORD_GAP:
+            text += ' '
+        text += word['text']
+        previous = word
+    return clean_text(text)
+
+def split_columns(words):
+    # Split a line at its widest gap when that gap is wide enough to be the
+    # space between a left and a right aligned column
+    widest, split_at = 0, None
+    for i in range(1, len(words)):
+        gap = words[i]['x0'] - words[i - 1]['x1']
+        if gap > widest:
+            widest, split_at = gap, i
+    if split_at is None or widest < COLUMN_GAP:
+        return join_words(words), ''
+    return join_words(words[:split_at]), join_words(words[split_at:])
+
+def extract_lines(file_path):
+    # Group the words of every page into lines, top to bottom
+    lines = []
+    links = []
+    offset = 0
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            words = page.extract_words(x_tolerance=1.5, keep_blank_chars=False)
+            words.sort(key=lambda w: (w['top'], w['x0']))
+            for word in words:
+                top = word['top'] + offset
+                if lines and top - lines[-1]['top'] <= LINE_TOLERANCE:
+                    lines[-1]['words'].append(word)
+                else:
+                    lines.append({'top': top, 'words': [word]})
+            for link in page.hyperlinks:
+                links.append({'uri': link.get('uri'), 'x0': link['x0'], 'x1': link['x1'],
+                              'top': link['top'] + offset, 'bottom': link['bottom'] + offset})
+            offset += page.height
+
+    for line in lines:
+        line['words'].sort(key=lambda w: w['x0'])
+        line['x0'] = line['words'][0]['x0']
+        line['bullet'] = line['words'][0]['text'] in BULLETS and len(line['words']) > 1
+        if line['bullet']:
+            line['words'] = line['words'][1:]
+        line['text'] = join_words(line['words'])
+    return lines, links
+
+def split_sections(lines):
+    # Everything before the first heading is the contact block
+    sections = {'information': []}
+    current = 'information'
+    for line in lines:
+        heading = SECTION_HEADINGS.get(line['text'].lower())
+        if heading and not line['bullet']:
+            current = heading
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+    return sections
+
+def append_text(text, addition):
+    if not text:
+        return addition
+    if text.endswith('-') and text[-2:-1].isalpha():
+        return text + addition
+    return text + ' ' + addition
+
+def split_entries(lines, margin):
+    # An entry is a run of subheading lines at the margin followed by its
+    # bullets; indented lines without a bullet continue the previous bullet
+    entries = []
+    for line in lines:
+        at_margin = line['x0'] <= margin + INDENT and not line['bullet']
+        if at_margin and (not entries or entries[-1]['description']):
+            entries.append({'headers': [line], 'description': []})
+        elif at_margin:
+            entries[-1]['headers'].append(line)
+        elif not entries:
+            continue
+        elif line['bullet'] or not entries[-1]['description']:
+            entries[-1]['description'].append(line['text'])
+        else:
+            entries[-1]['description'][-1] = append_text(entries[-1]['description'][-1], line['text'])
+    return entries
+
+def header_columns(entry, index):
+    if index >= len(entry['headers']):
+        return '', ''
+    return split_columns(entry['headers'][index]['words'])
+
+def link_for(line, links):
+    for link in links:
+        if link['uri'] and link['top'] <= line['top'] + LINE_TOLERANCE and link['bottom'] >= line['top']:
+            if link['x0'] <= line['words'][0]['x1']:
+                return link['uri']
+    return None
+
+def parse_information(lines):
+    information = {'name': None, 'location': None, 'phone': None,
+                   'email': None, 'linkedin': None, 'github': None}
+    for line in lines:
+        parts = [clean_text(part) for part in line['text'].split('|') if clean_text(part)]
+        for part in parts:
+            lowered = part.lower()
+            if '@' in part and '.' in part.split('@')[-1] and ' ' not in part:
+                information['email'] = part
+            elif 'linkedin' in lowered:
+                information['linkedin'] = part
+            elif 'github' in lowered:
+                information['github'] = part
+            elif PHONE_PATTERN.match(part):
+                information['phone'] = part
+            elif information['name'] is None:
+                information['name'] = part
+            elif information['location'] is None:
+                information['location'] = part
+    return information
+
+def parse_labelled(lines, resolve):
+    # "Label: value" lines, where values may wrap onto the next line
+    values = {}
+    key = None
+    for line in lines:
+        label, separator, value = line['text'].partition(':')
+        new_key = resolve(label) if separator else None
+        if new_key:
+            key = new_key
+            values[key] = append_text(values.get(key, ''), clean_text(value))
+        elif key:
+            values[key] = append_text(values[key], line['text'])
+    return values
+
+def skill_key(label):
+    label = label.lower()
+    for fragment, key in SKILL_LABELS:
+        if fragment in label:
+            return key
+    return None
+
+def education_key(label):
+    label = label.lower()
+    if 'coursework' in label or 'courses' in label:
+        return 'relevant-coursework'
+    if 'involvement' in label or 'club' in label or 'activities' in label:
+        return 'involvement'
+    return None
+
+def parse_education(lines):
+    # The comma-list fields start empty: most resumes have no coursework or
+    # involvement line
+    education = {'school': None, 'gpa': None, 'graduation': None, 'degree': None,
+                 'major': None, 'location': None, 'relevant-coursework': '', 'involvement': ''}
+    headers = [line for line in lines if ':' not in line['text'] or GPA_PATTERN.search(line['text'])][:2]
+    if headers:
+        school, graduation = split_columns(headers[0]['words'])
+        gpa = GPA_PATTERN.search(school)
+        if gpa:
+            education['gpa'] = float(gpa.group(1)) if re.match(r'^\d+(\.\d+)?$', gpa.group(1)) else gpa.group(1)
+            school = clean_text(school[:gpa.start()] + school[gpa.end():])
+        education['school'] = school.rstrip(',')
+        education['graduation'] = graduation or None
+    if len(headers) > 1:
+        degree, location = split_columns(headers[1]['words'])
+        degree, separator, major = degree.partition(' in ')
+        education['degree'] = degree
+        education['major'] = major if separator else None
+        education['location'] = location or None
+    education.update(parse_labelled(lines, education_key))
+    return education
+
+def parse_experience(entry):
+    company, dates = header_columns(entry, 0)
+    title, location = header_columns(entry, 1)
+    return {'company': company, 'title': title or None, 'location': location or None,
+            'dates': dates or None, 'description': entry['description']}
+
+def parse_research(entry):
+    group, dates = header_columns(entry, 0)
+    return {'group': group, 'dates': dates or None, 'description': entry['description']}
+
+def parse_project(entry, links):
+    heading, date = header_columns(entry, 0)
+    title, _, tech = heading.partition('|')
+    return {'title': clean_text(title), 'link': link_for(entry['headers'][0], links),
+            'date': date or None, 'tech': clean_text(tech) or None,
+            'description': entry['description']}
+
+def parse_pdf_text_layer(file_path):
+    # Returns the parsed resume, or None when the PDF has no usable text
+    # layer or the result doesn't pass validation
+    if pdfplumber is None:
+        return None
+    try:
+        lines, links = extract_lines(file_path)
+    except Exception as e:
+        print(f"Error reading PDF text layer: {str(e)}")
+        return None
+    if not lines:
+        return None
+
+    # A page of nothing but bullets has no headings to split entries on
+    heading_lines = [line for line in lines if not line['bullet']]
+    if not heading_lines:
+        return None
+    margin = min(line['x0'] for line in heading_lines)
+    sections = split_sections(lines)
+
+    resume = {
+        'information': parse_information(sections.get('information', [])),
+        'education': parse_education(sections.get('education', [])),
+        'technical-skills': {'languages': '', 'developer-tools': '', 'technologies': '', 'additional-skills': ''},
+        'experience': [parse_experience(entry) for entry in split_entries(sections.get('experience', []), margin)],
+        'research': [parse_research(entry) for entry in split_entries(sections.get('research', []), margin)],
+        'projects': [parse_project(entry, links) for entry in split_entries(sections.get('projects', []), margin)],
+    }
+    resume['technical-skills'].update(parse_labelled(sections.get('technical-skills', []), skill_key))
+
+    # Anything that doesn't fit the resume schema goes to the vision model
+    try:
+        return validate_resume(resume)
+    except ResumeValidationError:
+        return None
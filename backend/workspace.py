@@ -0,0 +1,45 @@
+import os
+import re
+import uuid
+from datetime import datetime
+
+RUN_ID_PATTERN = re.compile(r'^[A-Za-z0-9_]+$')
+
+def new_run_id():
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+def is_valid_run_id(run_id):
+    return bool(run_id) and RUN_ID_PATTERN.match(run_id) is not None
+
+
+class Workspace:
+    # Folders and files for one user's pipeline run. A workspace is passed
+    # explicitly to every step (upload parsing, scoring, reconstruct and PDF
+    # generation) so concurrent runs never share intermediate files.
+    def __init__(self, run_id=None, link_run_id=None, run_dir=None):
+        self.run_id = run_id or new_run_id()
+        if not is_valid_run_id(self.run_id):
+            raise ValueError(f'Invalid workspace id: {self.run_id!r}')
+        self.upload_dir = os.path.join('uploads', self.run_id)
+        self.parsed_dir = os.path.join('parsed_resumes', self.run_id)
+        self.job_postings_dir = os.path.join('job_postings', link_run_id or self.run_id)
+        self.run_dir = run_dir if run_dir is not None else os.path.join('runs', self.run_id)
+        self.analysis_path = os.path.join(self.run_dir, 'resume_analysis.txt')
+        self.individual_analysis_path = os.path.join(self.run_dir, 'individual_resume_analysis.txt')
+        self.handoff_path = os.path.join(self.run_dir, 'scoring_results.json')
+        self.new_resume_path = os.path.join(self.run_dir, 'new_resume.yaml')
+
+    @classmethod
+    def from_timestamp_files(cls):
+        # The layout used when model.py or reconstruct.py run as standalone
+        # scripts: folders named by run_timestamp_*.txt, reports in the cwd
+        with open('run_timestamp_file.txt', 'r') as f:
+            file_timestamp = f.read().strip()
+        with open('run_timestamp_link.txt', 'r') as f:
+            link_timestamp = f.read().strip()
+        return cls(file_timestamp, link_run_id=link_timestamp, run_dir='.')
+
+    def create(self):
+        for folder in [self.upload_dir, self.parsed_dir, self.job_postings_dir, self.run_dir]:
+            os.makedirs(folder, exist_ok=True)
+        return self
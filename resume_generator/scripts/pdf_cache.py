@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+# Rendered resume PDFs stored under content-addressed names. The key is the
+# SHA-256 of the normalized resume data together with the template version,
+# so clicking "generate" again on an unchanged resume serves the PDF that
+# was already compiled, and a file's name never refers to different bytes.
+# The directory is kept under max_bytes by evicting least recently used
+# files first. Concurrent requests for the same key wait for the one render
+# instead of compiling it again.
+
+ENTRY_PATTERN = re.compile(r'^[0-9a-f]{64}\.pdf$')
+
+
+class PdfCache:
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock, number of requests holding or waiting]
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key_for(data, template_version):
+        # Key order and YAML formatting don't change the PDF, so hash a
+        # canonical JSON form of the data
+        normalized = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+        digest = hashlib.sha256(template_version.encode('utf-8'))
+        digest.update(normalized.encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def is_entry_name(filename):
+        return bool(ENTRY_PATTERN.match(filename or ''))
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f'{key}.pdf')
+
+    def _lookup(self, key):
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get(self, key):
+        path = self._lookup(key)
+        with self._lock:
+            if path is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return path
+
+    def _acquire(self, key):
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+
+    def _release(self, key):
+        with self._lock:
+            entry = self._key_locks[key]
+            entry[0].release()
+            entry[1] -= 1
+            if not entry[1]:
+                del self._key_locks[key]
+
+    def get_or_render(self, key, render):
+        # render(path) must write the PDF to path atomically; returns the
+        # cached path
+        path = self.get(key)
+        if path is not None:
+            return path
+        self._acquire(key)
+        try:
+            # Another request may have rendered it while this one waited
+            path = self._lookup(key)
+            if path is not None:
+                return path
+            path = self.path_for(key)
+            render(path)
+        finally:
+            self._release(key)
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep=None):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if ENTRY_PATTERN.match(name):
+                    path = os.path.join(self.directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from template_renderer import load_template
+
+# In-process resume PDF rendering. Each job renders the compiled template,
+# writes it to its own temp directory and runs pdflatex there, so concurrent
+# jobs never share a .tex or .pdf. A semaphore bounds how many LaTeX
+# processes run at once, and the package-loading part of the preamble is
+# dumped once into a LaTeX format file so each compile starts with the
+# packages already loaded and only processes the rest of the document.
+
+GENERATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(GENERATOR_DIR, 'templates', 'template.tex')
+FORMAT_DIR = os.path.join(GENERATOR_DIR, 'cache', 'formats')
+
+
+class PdfRenderError(Exception):
+    pass
+
+
+def split_preamble(source):
+    # Everything up to the last \usepackage line goes into the format; the
+    # rest of the preamble (custom commands, \input{glyphtounicode} and the
+    # pdftex settings, which a format doesn't keep) runs in every compile
+    lines = source.splitlines(keepends=True)
+    last_package = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('\\begin{document}'):
+            break
+        if stripped.startswith('\\usepackage') or stripped.startswith('\\documentclass'):
+            last_package = i
+    if last_package is None:
+        return '', source
+    return ''.join(lines[:last_package + 1]), ''.join(lines[last_package + 1:])
+
+def log_tail(directory, jobname, lines=20):
+    log_path = os.path.join(directory, f'{jobname}.log')
+    if not os.path.exists(log_path):
+        return ''
+    with open(log_path, 'r', errors='replace') as file:
+        return ''.join(file.readlines()[-lines:])
+
+
+class PdfService:
+    def __init__(self, template_path=TEMPLATE_PATH, format_dir=FORMAT_DIR, max_workers=2,
+                 latex='pdflatex', timeout=60, use_format=True):
+        self.template_path = template_path
+        self.format_dir = format_dir
+        self.latex = latex
+        self.timeout = timeout
+        self.use_format = use_format
+        self.compiles = 0
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._format_lock = threading.Lock()
+        self._formats = {}
+
+    def _run(self, args, cwd, env=None):
+        return subprocess.run(args, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              stdin=subprocess.DEVNULL, timeout=self.timeout)
+
+    def _format_for(self, preamble):
+        # Returns the format name for this preamble, building it on first use,
+        # or None if formats are off or the build failed
+        if not self.use_format or not preamble:
+            return None
+        key = 'resume_' + hashlib.sha256(preamble.encode('utf-8')).hexdigest()[:16]
+        name = key
+        with self._format_lock:
+            if key in self._formats:
+                return self._formats[key]
+            if not os.path.exists(os.path.join(self.format_dir, f'{name}.fmt')):
+                os.makedirs(self.format_dir, exist_ok=True)
+                with tempfile.TemporaryDirectory() as build_dir:
+                    with open(os.path.join(build_dir, f'{name}.tex'), 'w') as file:
+                        file.write(preamble)
+                    try:
+                        self._run([self.latex, '-ini', '-interaction=nonstopmode', f'-jobname={name}',
+                                   f'&{self.latex} {name}.tex\\dump'], cwd=build_dir)
+                    except (OSError, subprocess.TimeoutExpired) as e:
+                        # A missing pdflatex or a hung dump: remember the failure so
+                        # later requests don't retry it, and let the compile report it
+                        print(f"Could not build LaTeX format {name} ({e}); compiling full preambles instead")
+                        self._formats[key] = None
+                        return None
+                    built = os.path.join(build_dir, f'{name}.fmt')
+                    if os.path.exists(built):
+                        os.replace(built, os.path.join(self.format_dir, f'{name}.fmt'))
+                    else:
+                        print(f"Could not build LaTeX format {name}; compiling full preambles instead")
+            if not os.path.exists(os.path.join(self.format_dir, f'{name}.fmt')):
+                name = None
+            self._formats[key] = name
+            return name
+
+    def _compile(self, source, build_dir, jobname, format_name):
+        with open(os.path.join(build_dir, f'{jobname}.tex'), 'w') as file:
+            file.write(source)
+        args = [self.latex, '-interaction=nonstopmode', '-halt-on-error', f'-jobname={jobname}']
+        env = None
+        if format_name:
+            env = dict(os.environ, TEXFORMATS=self.format_dir + os.pathsep)
+            args.append(f'-fmt={format_name}')
+        args.append(f'{jobname}.tex')
+        with self._slots:
+            self._run(args, cwd=build_dir, env=env)
+            self.compiles += 1
+        return os.path.join(build_dir, f'{jobname}.pdf')
+
+    def template_version(self):
+        return load_template(self.template_path).version
+
+    def render_tex(self, data):
+        return load_template(self.template_path).render(data)
+
+    def render_pdf(self, data, output_path, tex_path=None):
+        # Renders data to output_path; tex_path optionally keeps the LaTeX
+        # source next to it. Raises PdfRenderError with the end of the LaTeX
+        # log when no PDF comes out.
+        source = self.render_tex(data)
+        preamble, body = split_preamble(source)
+        format_name = self._format_for(preamble)
+
+        with tempfile.TemporaryDirectory(prefix='resume_') as build_dir:
+            jobname = 'resume'
+            try:
+                pdf_path = self._compile(body if format_name else source, build_dir, jobname, format_name)
+                if format_name and not os.path.exists(pdf_path):
+                    # A stale or incompatible format: fall back to the full preamble
+                    pdf_path = self._compile(source, build_dir, jobname, None)
+            except subprocess.TimeoutExpired:
+                raise PdfRenderError(f'LaTeX timed out after {self.timeout}s')
+            except FileNotFoundError:
+                raise PdfRenderError(f'{self.latex} is not installed')
+
+            if not os.path.exists(pdf_path):
+                raise PdfRenderError('PDF file not generated\n' + log_tail(build_dir, jobname))
+
+            output_dir = os.path.dirname(os.path.abspath(output_path))
+            os.makedirs(output_dir, exist_ok=True)
+            # Copy to a staging file of its own next to the destination first,
+            # so readers and concurrent renders never see a partial file
+            descriptor, staging_path = tempfile.mkstemp(prefix=f'.{os.path.basename(output_path)}.', suffix='.tmp',
+                                                        dir=output_dir)
+            os.close(descriptor)
+            try:
+                shutil.copyfile(pdf_path, staging_path)
+                os.replace(staging_path, output_path)
+            except BaseException:
+                if os.path.exists(staging_path):
+                    os.remove(staging_path)
+                raise
+            if tex_path:
+                with open(tex_path, 'w') as file:
+                    file.write(source)
+        return output_path
+
+    def render_cached(self, data, cache):
+        # Returns the path of the PDF for data in cache, compiling it only
+        # when this resume hasn't been rendered with this template before
+        key = cache.key_for(data, self.template_version())
+        return cache.get_or_render(key, lambda path: self.render_pdf(data, path))
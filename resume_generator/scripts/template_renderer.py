@@ -0,0 +1,157 @@
+import hashlib
+import os
+import re
+
+# Compiled LaTeX resume templates. A template is parsed once into a node
+# tree and rendered in a single pass, instead of running one re.sub over
+# the whole template per YAML field.
+#
+# Syntax:
+#   {{ experience.0.company }}             value, LaTeX-escaped; empty when missing or null
+#   {% for job in experience %} ... {% endfor %}
+#   {% for line in job.description[:6] %}  at most the first 6 items
+#   {% if job.company and job.title %} ... {% else %} ... {% endif %}
+# A block tag on a line of its own takes the whole line with it, so tags
+# don't leave blank lines (paragraph breaks) in the LaTeX.
+
+TOKEN_PATTERN = re.compile(r'\{\{\s*([\w.-]+)\s*\}\}|\{%\s*(.*?)\s*%\}')
+FOR_PATTERN = re.compile(r'^for\s+(\w+)\s+in\s+([\w.-]+)(?:\[:(\d+)\])?$')
+IF_PATTERN = re.compile(r'^if\s+(.+)$')
+LATEX_SPECIAL = re.compile(r'([&%$#_{}])')
+
+
+class TemplateError(Exception):
+    pass
+
+
+def escape_latex(value):
+    return LATEX_SPECIAL.sub(r'\\\1', str(value))
+
+def compile_path(path):
+    return tuple(int(part) if part.isdigit() else part for part in path.split('.'))
+
+def tokenize(source):
+    # Yields ('text', str), ('var', path) and ('tag', str) tokens
+    tokens = []
+    position = 0
+    for match in TOKEN_PATTERN.finditer(source):
+        start, end = match.span()
+        if match.group(1) is not None:
+            tokens.append(('text', source[position:start]))
+            tokens.append(('var', match.group(1)))
+            position = end
+            continue
+
+        # Block tag: swallow its line when nothing else is on it
+        line_start = source.rfind('\n', 0, start) + 1
+        line_end = source.find('\n', end)
+        line_end = len(source) if line_end == -1 else line_end
+        if not source[line_start:start].strip() and not source[end:line_end].strip() and line_start >= position:
+            start = line_start
+            end = min(line_end + 1, len(source))
+        tokens.append(('text', source[position:start]))
+        tokens.append(('tag', match.group(2)))
+        position = end
+    tokens.append(('text', source[position:]))
+    return [token for token in tokens if token != ('text', '')]
+
+def parse(tokens):
+    # Nodes: ('text', str), ('var', path), ('for', name, path, limit, body),
+    # ('if', [paths], body, else_body)
+    root = []
+    stack = [('root', root)]
+    for kind, value in tokens:
+        body = stack[-1][1]
+        if kind == 'text':
+            body.append(('text', value))
+        elif kind == 'var':
+            body.append(('var', compile_path(value)))
+        elif FOR_PATTERN.match(value):
+            name, path, limit = FOR_PATTERN.match(value).groups()
+            node = ['for', name, compile_path(path), int(limit) if limit else None, []]
+            body.append(node)
+            stack.append(('for', node[4]))
+        elif IF_PATTERN.match(value):
+            paths = [compile_path(part.strip()) for part in IF_PATTERN.match(value).group(1).split(' and ')]
+            node = ['if', paths, [], []]
+            body.append(node)
+            stack.append(('if', node[2], node))
+        elif value == 'else':
+            if stack[-1][0] != 'if':
+                raise TemplateError('{% else %} outside of {% if %}')
+            node = stack.pop()[2]
+            stack.append(('else', node[3]))
+        elif value in ('endfor', 'endif'):
+            opened = stack.pop()[0]
+            if (value == 'endfor') != (opened == 'for') or opened == 'root':
+                raise TemplateError(f'Unexpected {{% {value} %}}')
+        else:
+            raise TemplateError(f'Unknown tag: {{% {value} %}}')
+    if len(stack) != 1:
+        raise TemplateError(f'Unclosed {{% {stack[-1][0]} %}} block')
+    return root
+
+def resolve(path, scopes):
+    # Loop variables shadow the top-level data
+    head = path[0]
+    for scope in reversed(scopes):
+        if isinstance(scope, dict) and head in scope:
+            value = scope[head]
+            break
+    else:
+        return None
+    for part in path[1:]:
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and isinstance(part, int) and part < len(value):
+            value = value[part]
+        else:
+            return None
+    return value
+
+def render_nodes(nodes, scopes, out):
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            out.append(node[1])
+        elif kind == 'var':
+            value = resolve(node[1], scopes)
+            if value is not None:
+                out.append(escape_latex(value))
+        elif kind == 'for':
+            _, name, path, limit, body = node
+            items = resolve(path, scopes) or []
+            if limit is not None:
+                items = items[:limit]
+            for item in items:
+                scopes.append({name: item})
+                render_nodes(body, scopes, out)
+                scopes.pop()
+        else:
+            _, paths, body, else_body = node
+            render_nodes(body if all(resolve(path, scopes) for path in paths) else else_body, scopes, out)
+
+
+class Template:
+    def __init__(self, source):
+        self.nodes = parse(tokenize(source))
+        # Changes whenever the template text does; part of rendered-PDF cache keys
+        self.version = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+
+    def render(self, data):
+        out = []
+        render_nodes(self.nodes, [data], out)
+        return ''.join(out)
+
+
+_compiled = {}
+
+def load_template(path):
+    # Compiled templates are kept per path and recompiled when the file changes
+    mtime = os.path.getmtime(path)
+    cached = _compiled.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'r') as file:
+            cached = (mtime, Template(file.read()))
+        _compiled[path] = cached
+    return cached[1]